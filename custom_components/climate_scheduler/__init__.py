@@ -376,6 +376,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Unload all platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "climate", "switch"])
     
+    # Write out any debounced save before storage can be dropped and reloaded from disk
+    storage = hass.data.get(DOMAIN, {}).get("storage")
+    if storage is not None:
+        await storage.async_flush()
+    
     # Remove panel and services only if this is the last entry
     entries = hass.config_entries.async_entries(DOMAIN)
     if len(entries) <= 1:
@@ -17,7 +17,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.unit_conversion import TemperatureConverter
 
-from .const import DOMAIN
+from .const import DOMAIN, PREV_DAY
 from .coordinator import HeatingSchedulerCoordinator
 from .storage import ScheduleStorage
 
@@ -181,7 +181,7 @@ class ClimateSchedulerGroupEntity(CoordinatorEntity, ClimateEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # Update enabled state and profiles from storage
-        group_data = self._storage._data.get("groups", {}).get(self._group_name)
+        group_data = self._storage._groups.get(self._group_name)
         if group_data:
             self._enabled = group_data.get("enabled", True)
             profiles = group_data.get("profiles", {})
@@ -243,7 +243,7 @@ class ClimateSchedulerGroupEntity(CoordinatorEntity, ClimateEntity):
         current_day = datetime.now().strftime('%a').lower()
         
         # Get the schedule data from storage (synchronously accessible)
-        group_data = self._storage._data.get("groups", {}).get(self._group_name, {})
+        group_data = self._storage._groups.get(self._group_name, {})
         schedule_mode = group_data.get("schedule_mode", "all_days")
         schedules = group_data.get("schedules", {})
         
@@ -260,14 +260,13 @@ class ClimateSchedulerGroupEntity(CoordinatorEntity, ClimateEntity):
         
         # In individual or 5/2 mode, if current time is before all nodes today,
         # use previous day's last node
+        carried_over = False
         if schedule_mode in ["individual", "5/2"] and nodes:
-            sorted_nodes = sorted(nodes, key=lambda n: self._storage._time_to_minutes(n["time"]))
+            minutes, _ = self._storage.sorted_schedule(nodes)
             current_minutes = current_time.hour * 60 + current_time.minute
-            if sorted_nodes and current_minutes < self._storage._time_to_minutes(sorted_nodes[0]["time"]):
+            if current_minutes < minutes[0]:
                 # We're before the first node of today, need previous day/period's last node
-                days_of_week = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-                current_day_index = days_of_week.index(current_day)
-                prev_day = days_of_week[(current_day_index - 1) % 7]
+                prev_day = PREV_DAY[current_day]
                 
                 # Get previous day's nodes based on schedule mode
                 if schedule_mode == "5/2":
@@ -281,16 +280,17 @@ class ClimateSchedulerGroupEntity(CoordinatorEntity, ClimateEntity):
                     prev_day_nodes = schedules.get(prev_day, [])
                 
                 if prev_day_nodes:
-                    sorted_prev_nodes = sorted(prev_day_nodes, key=lambda n: self._storage._time_to_minutes(n["time"]))
-                    last_prev_node = sorted_prev_nodes[-1]
+                    last_prev_node = self._storage.sorted_schedule(prev_day_nodes)[1][-1]
                     # Prepend previous day's last node with time "00:00"
                     carryover_node = {**last_prev_node, "time": "00:00"}
                     nodes = [carryover_node] + nodes
+                    carried_over = True
         
         # Determine the active setpoint from schedule
         active_setpoint = None
         if nodes:
-            active_node = self._storage.get_active_node(nodes, current_time)
+            # A carried-over list is built per call, so it skips the sorted-view cache
+            active_node = self._storage.get_active_node(nodes, current_time, cache=not carried_over)
             if active_node:
                 active_setpoint = active_node.get("temp")
                 _LOGGER.debug(f"Active node for {self._group_name}: temp={active_setpoint}")
@@ -397,7 +397,7 @@ class ClimateSchedulerGroupEntity(CoordinatorEntity, ClimateEntity):
         current_time = datetime.now().time()
         current_day = datetime.now().strftime('%a').lower()
         
-        group_data = self._storage._data.get("groups", {}).get(self._group_name, {})
+        group_data = self._storage._groups.get(self._group_name, {})
         schedules = group_data.get("schedules", {})
         schedule_data = schedules.get(current_day)
         
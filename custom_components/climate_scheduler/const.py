@@ -5,6 +5,7 @@ DOMAIN = "climate_scheduler"
 # Storage
 STORAGE_VERSION = 1
 STORAGE_KEY = "climate_scheduler_data"
+ADVANCE_STORAGE_KEY = "climate_scheduler_advance_history"
 
 # Default schedule nodes (time in HH:MM format, temp in Celsius)
 DEFAULT_SCHEDULE = []
@@ -21,4 +22,9 @@ SETTING_USE_WORKDAY = "use_workday_integration"  # Whether to use Workday integr
 SETTING_WORKDAYS = "workdays"  # List of days considered workdays (e.g., ["mon", "tue", "wed", "thu", "fri"])
 
 # Default workdays (Monday through Friday)
-DEFAULT_WORKDAYS = ["mon", "tue", "wed", "thu", "fri"]
\ No newline at end of file
+DEFAULT_WORKDAYS = ["mon", "tue", "wed", "thu", "fri"]
+
+# Day abbreviations in datetime.weekday() order, with wrap-around neighbours
+DAYS_OF_WEEK = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+PREV_DAY = {day: DAYS_OF_WEEK[index - 1] for index, day in enumerate(DAYS_OF_WEEK)}
+NEXT_DAY = {day: DAYS_OF_WEEK[(index + 1) % 7] for index, day in enumerate(DAYS_OF_WEEK)}
\ No newline at end of file
@@ -1,4 +1,5 @@
 """Coordinator for Climate Scheduler."""
+import bisect
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
@@ -8,7 +9,7 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, Upda
 from homeassistant.const import ATTR_TEMPERATURE
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, MIN_TEMP, MAX_TEMP, NO_CHANGE_TEMP, SETTING_USE_WORKDAY, SETTING_WORKDAYS, DEFAULT_WORKDAYS
+from .const import DOMAIN, MIN_TEMP, MAX_TEMP, NO_CHANGE_TEMP, SETTING_USE_WORKDAY, SETTING_WORKDAYS, DEFAULT_WORKDAYS, NEXT_DAY, PREV_DAY
 from .storage import ScheduleStorage
 
 _LOGGER = logging.getLogger(__name__)
@@ -105,7 +106,7 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
     async def async_config_entry_first_refresh(self) -> None:
         """Handle the first refresh."""
         # Load advance history from storage
-        self.advance_history = await self.storage.async_get_advance_history()
+        self.advance_history = self.storage.get_advance_history()
         _LOGGER.debug(f"Loaded advance history from storage: {self.advance_history}")
         # Check for workday integration
         self._check_workday_integration()
@@ -136,7 +137,7 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
         
         # Then check if user has enabled it in settings
         try:
-            settings = await self.storage.async_get_settings()
+            settings = self.storage.get_settings()
             use_workday = settings.get(SETTING_USE_WORKDAY, False)
             return use_workday
         except Exception as e:
@@ -146,7 +147,7 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
     async def get_workdays(self) -> List[str]:
         """Return list of days considered workdays from settings."""
         try:
-            settings = await self.storage.async_get_settings()
+            settings = self.storage.get_settings()
             workdays = settings.get(SETTING_WORKDAYS, DEFAULT_WORKDAYS)
             # Validate workdays list
             if not isinstance(workdays, list) or not workdays:
@@ -194,30 +195,29 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
         
         # Load global settings (min/max temps)
         try:
-            settings = await self.storage.async_get_settings()
+            settings = self.storage.get_settings()
         except Exception:
             settings = {}
         min_temp = settings.get("min_temp", MIN_TEMP)
         max_temp = settings.get("max_temp", MAX_TEMP)
         
         # Find the entity's group (all entities are in groups now)
-        groups = await self.storage.async_get_groups()
         schedule_data = None
         group_name = None
         
-        for g_name, group_data in groups.items():
-            if not group_data.get("enabled", True):
+        for g_name in self.storage.get_entity_groups(entity_id):
+            group_data = await self.storage.async_get_group(g_name)
+            if not group_data or not group_data.get("enabled", True):
                 continue
             # Skip ignored groups
             if group_data.get("ignored", False):
                 continue
-            if entity_id in group_data.get("entities", []):
-                schedule_data = await self.storage.async_get_group_schedule(g_name, current_day)
-                group_name = g_name
-                is_single = group_data.get("_is_single_entity_group", False)
-                group_type = "single-entity" if is_single else "multi-entity"
-                _LOGGER.info(f"{entity_id} is in enabled {group_type} group '{g_name}'")
-                break
+            schedule_data = await self.storage.async_get_group_schedule(g_name, current_day)
+            group_name = g_name
+            is_single = group_data.get("_is_single_entity_group", False)
+            group_type = "single-entity" if is_single else "multi-entity"
+            _LOGGER.info(f"{entity_id} is in enabled {group_type} group '{g_name}'")
+            break
         
         # If not in any group, entity schedule is effectively disabled or ignored
         if not schedule_data:
@@ -242,34 +242,26 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
         # Get the next node with day-aware wrap-around.
         schedule_mode = schedule_data.get("schedule_mode", "all_days")
         current_minutes = current_time.hour * 60 + current_time.minute
-        def _time_to_minutes(time_str: str) -> int:
-            hours, minutes = map(int, time_str.split(":"))
-            return hours * 60 + minutes
-
-        sorted_nodes = sorted(nodes, key=lambda n: _time_to_minutes(n["time"]))
+        minutes, sorted_nodes = self.storage.sorted_schedule(nodes)
 
         next_node = None
         next_node_day = current_day
 
         # Try to find the next node later today first.
-        for node in sorted_nodes:
-            node_minutes = _time_to_minutes(node["time"])
-            if node_minutes > current_minutes:
-                next_node = node
-                break
+        index = bisect.bisect_right(minutes, current_minutes)
+        if index < len(sorted_nodes):
+            next_node = sorted_nodes[index]
 
         # If none later today, wrap to tomorrow's first node where relevant.
         if next_node is None:
-            days_of_week = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-            current_day_index = days_of_week.index(current_day)
-            next_day = days_of_week[(current_day_index + 1) % 7]
+            next_day = NEXT_DAY[current_day]
 
             # In schedule modes with day-specific schedules, prefer tomorrow's first node.
             if schedule_mode in ["individual", "5/2"]:
                 next_day_schedule = await self.storage.async_get_group_schedule(group_name, next_day)
                 next_day_nodes = next_day_schedule.get("nodes", []) if next_day_schedule else []
                 if next_day_nodes:
-                    next_node = sorted(next_day_nodes, key=lambda n: _time_to_minutes(n["time"]))[0]
+                    next_node = self.storage.sorted_schedule(next_day_nodes)[1][0]
                     next_node_day = next_day
 
             # Fallback: wrap to today's first node if tomorrow schedule is empty/missing.
@@ -637,7 +629,7 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
             _LOGGER.info(f"Current time: {current_time}, day: {current_day}")
             # Load global settings (min/max temps)
             try:
-                settings = await self.storage.async_get_settings()
+                settings = self.storage.get_settings()
             except Exception:
                 settings = {}
             min_temp = settings.get("min_temp", MIN_TEMP)
@@ -675,31 +667,30 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
                     
                     if schedule_mode in ["individual", "5/2"] and nodes:
                         # Check if current time is before all nodes today
-                        sorted_nodes = sorted(nodes, key=lambda n: self.storage._time_to_minutes(n["time"]))
+                        minutes, sorted_nodes = self.storage.sorted_schedule(nodes)
                         current_minutes = current_time.hour * 60 + current_time.minute
-                        first_node_minutes = self.storage._time_to_minutes(sorted_nodes[0]["time"])
+                        first_node_minutes = minutes[0]
                         
                         if current_minutes < first_node_minutes:
                             # We're before the first node of today, need previous day/period's last node
                             _LOGGER.info(f"Group '{group_name}': Current time {current_time} is before first node today, checking previous period")
                             
                             # Calculate previous day
-                            days_of_week = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-                            current_day_index = days_of_week.index(current_day)
-                            prev_day = days_of_week[(current_day_index - 1) % 7]
+                            prev_day = PREV_DAY[current_day]
                             
                             # Get previous day's schedule
                             prev_day_schedule = await self.storage.async_get_group_schedule(group_name, prev_day)
                             if prev_day_schedule and prev_day_schedule.get("nodes"):
                                 # Use previous day's last node as the active node until first node today
                                 prev_nodes = prev_day_schedule["nodes"]
-                                sorted_prev_nodes = sorted(prev_nodes, key=lambda n: self.storage._time_to_minutes(n["time"]))
-                                last_prev_node = sorted_prev_nodes[-1]
+                                last_prev_node = self.storage.sorted_schedule(prev_nodes)[1][-1]
                                 
                                 # Prepend the previous day's last node to today's schedule with time "00:00"
                                 # This way get_active_node will correctly use it as the active node until first node today
                                 carryover_node = {**last_prev_node, "time": "00:00", "_from_previous_day": True}
                                 group_schedule["nodes"] = [carryover_node] + nodes
+                                # Built per refresh, so kept out of the storage sorted-view cache
+                                group_schedule["_from_previous_day"] = True
                                 _LOGGER.info(f"Group '{group_name}': Carrying over previous period's node (temp={last_prev_node.get('temp')}) to bridge to first node at {sorted_nodes[0]['time']}")
                     
                     entities_list = group_data.get("entities", [])
@@ -732,7 +723,9 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
                     _LOGGER.info(f"Processing virtual group: '{group_name}'")
                     
                     nodes = schedule_data["nodes"]
-                    active_node = self.storage.get_active_node(nodes, current_time)
+                    active_node = self.storage.get_active_node(
+                        nodes, current_time, cache=not schedule_data.get("_from_previous_day", False)
+                    )
                     if not active_node:
                         _LOGGER.debug(f"No active node for virtual group '{group_name}'")
                         continue
@@ -847,7 +840,9 @@ class HeatingSchedulerCoordinator(DataUpdateCoordinator):
                 _LOGGER.info(f"{entity_id} has {len(nodes)} nodes for {current_day}")
                 
                 # Get active node (includes temp and other settings)
-                active_node = self.storage.get_active_node(nodes, current_time)
+                active_node = self.storage.get_active_node(
+                    nodes, current_time, cache=not schedule_data.get("_from_previous_day", False)
+                )
                 if not active_node:
                     _LOGGER.debug(f"No active node for {entity_id}")
                     continue
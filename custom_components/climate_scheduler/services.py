@@ -11,7 +11,7 @@ from homeassistant.util import json as json_util
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .const import DOMAIN, DAYS_OF_WEEK
 from .coordinator import HeatingSchedulerCoordinator
 from .storage import ScheduleStorage
 
@@ -710,11 +710,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
 
         # Collect climate entities from storage groups
         storage: ScheduleStorage = hass.data[DOMAIN]["storage"]
-        groups = await storage.async_get_groups()
-        all_climate_entities = set()
-        for group_name, group_data in groups.items():
-            entities_list = group_data.get("entities", [])
-            all_climate_entities.update(entities_list)
+        all_climate_entities = set(await storage.async_get_all_entities())
 
         # Use settings to decide whether derivative sensors are expected
         settings = storage._data.get("settings", {})
@@ -1220,7 +1216,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     
     async def handle_get_settings(call: ServiceCall) -> dict:
         """Handle get_settings service call."""
-        settings = await storage.async_get_settings()
+        settings = storage.get_settings()
         
         # Include version information
         from homeassistant.const import __version__ as ha_version
@@ -1324,7 +1320,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not day:
             import datetime
             now = datetime.datetime.now()
-            day = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][now.weekday()]
+            day = DAYS_OF_WEEK[now.weekday()]
         
         # Determine if this is a group or entity
         all_groups = await storage.async_get_groups()
@@ -1364,12 +1360,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         else:
             # Assume it's an entity - find its group
             entity_id = target_id
-            group_name = None
-            
-            for gname, gdata in all_groups.items():
-                if entity_id in gdata.get("entities", []):
-                    group_name = gname
-                    break
+            group_name = await storage.async_get_entity_group(entity_id)
             
             if not group_name:
                 _LOGGER.error(f"Entity {entity_id} not found in any group")
@@ -1477,7 +1468,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         profiles = await storage.async_get_profiles(target_id)
         active_profile = await storage.async_get_active_profile_name(target_id)
         return {
-            "profiles": profiles,
+            "profiles": dict(profiles),
             "active_profile": active_profile
         }
     
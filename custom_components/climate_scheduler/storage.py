@@ -1,18 +1,90 @@
 """Storage management for Climate Scheduler."""
+import asyncio
+import bisect
+import functools
 import logging
-import copy
 import re
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from datetime import datetime, time
 
-from homeassistant.core import HomeAssistant
+import orjson
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.storage import Store
 from homeassistant.const import UnitOfTemperature
 
-from .const import DOMAIN, STORAGE_VERSION, STORAGE_KEY, DEFAULT_SCHEDULE, MIN_TEMP, MAX_TEMP
+from .const import DOMAIN, STORAGE_VERSION, STORAGE_KEY, ADVANCE_STORAGE_KEY, DEFAULT_SCHEDULE, MIN_TEMP, MAX_TEMP, PREV_DAY
 
 _LOGGER = logging.getLogger(__name__)
 
+_WEEKDAYS = frozenset({"mon", "tue", "wed", "thu", "fri"})
+
+_VERSION_RE = re.compile(r"\d+")
+
+# Layout revision recorded in _data["_schema_version"] once the per-record
+# migrations in async_load (day schedules, profiles, entities -> groups) have run
+SCHEMA_VERSION = 3
+
+# Seconds to hold a debounced save so bursts of mutations share one write
+SAVE_DELAY = 0.5
+
+# Upper bound on node lists held by the sorted-schedule cache before it is reset
+_SORTED_CACHE_MAX = 256
+
+# Registry removals performed between yields to the event loop during bulk cleanup
+_REMOVE_BATCH_SIZE = 50
+
+# Returned by async_get_profiles for unknown groups, read-only like the profile view
+_EMPTY_PROFILES: Mapping[str, Any] = MappingProxyType({})
+
+# Derivative sensor unique_ids: climate_scheduler_<climate object id>_rate
+_RATE_SENSOR_PREFIX = "climate_scheduler_"
+_RATE_SENSOR_SUFFIX = "_rate"
+
+# Settings seeded on first load and by factory reset, keyed by the HA unit system
+_DEFAULT_SETTINGS_C: Dict[str, Any] = {"min_temp": 5.0, "max_temp": 30.0, "create_derivative_sensors": True}
+_DEFAULT_SETTINGS_F: Dict[str, Any] = {"min_temp": 42.0, "max_temp": 86.0, "create_derivative_sensors": True}
+
+# Schedule modes
+MODE_ALL_DAYS = "all_days"
+MODE_5_2 = "5/2"
+MODE_INDIVIDUAL = "individual"
+
+# (schedule_mode, day) -> key in the schedules dict. Pairs not listed here are
+# resolved by the fallback in _schedule_bucket(): any other 5/2 day (including
+# None) reads the weekend schedule, other modes key schedules by the day itself.
+_SCHEDULE_BUCKETS: Dict[tuple, str] = {
+    (MODE_5_2, "weekday"): "weekday",
+    (MODE_5_2, "weekend"): "weekend",
+    **{(MODE_5_2, day): "weekday" for day in _WEEKDAYS},
+}
+
+# Key written by async_set_group_schedule when no day is given
+_DEFAULT_WRITE_BUCKETS: Dict[str, str] = {MODE_ALL_DAYS: "all_days", MODE_5_2: "weekday"}
+
+
+def _schedule_bucket(mode: str, day: Optional[str]) -> Optional[str]:
+    """Return the schedules key that nodes for a mode/day pair live under."""
+    bucket = _SCHEDULE_BUCKETS.get((mode, day))
+    if bucket is None:
+        bucket = "weekend" if mode == MODE_5_2 else day
+    return bucket
+
+
+@functools.lru_cache(maxsize=2048)
+def _time_to_minutes(time_str: str) -> int:
+    """Convert HH:MM string to minutes since midnight.
+
+    Memoized: there are at most 1440 distinct valid times, and every tick
+    re-evaluates the same node strings.
+    """
+    parts = time_str.split(":")
+    hours = int(parts[0])
+    minutes = int(parts[1])
+    return hours * 60 + minutes
+
 
 def validate_node(node: Dict[str, Any]) -> bool:
     """Validate a schedule node structure."""
@@ -30,26 +102,62 @@ def validate_node(node: Dict[str, Any]) -> bool:
         _LOGGER.error(f"Invalid time format: {time_str}")
         return False
     
-    try:
-        hours, minutes = time_str.split(":")
-        h, m = int(hours), int(minutes)
-        # Normalize 24:00 to 23:59 to avoid clash with 00:00 on next day
-        if h == 24 and m == 0:
-            h, m = 23, 59
-        if not (0 <= h <= 23 and 0 <= m <= 59):
-            _LOGGER.error(f"Time out of range: {time_str}")
-            return False
-    except (ValueError, AttributeError):
+    # Fixed-width HH:MM, so parse the four digits directly instead of split()/int()
+    h1 = ord(time_str[0]) - 48
+    h2 = ord(time_str[1]) - 48
+    m1 = ord(time_str[3]) - 48
+    m2 = ord(time_str[4]) - 48
+    if not (0 <= h1 <= 9 and 0 <= h2 <= 9 and 0 <= m1 <= 9 and 0 <= m2 <= 9):
         _LOGGER.error(f"Cannot parse time: {time_str}")
         return False
-    
-    # Validate temperature is numeric
-    try:
-        float(node["temp"])
-    except (ValueError, TypeError):
-        _LOGGER.error(f"Invalid temperature: {node.get('temp')}")
+    h = h1 * 10 + h2
+    m = m1 * 10 + m2
+    # Normalize 24:00 to 23:59 to avoid clash with 00:00 on next day
+    if h == 24 and m == 0:
+        h, m = 23, 59
+    if not (0 <= h <= 23 and 0 <= m <= 59):
+        _LOGGER.error(f"Time out of range: {time_str}")
         return False
     
+    # Validate temperature is numeric (numbers skip the float() conversion attempt)
+    temp = node["temp"]
+    if not isinstance(temp, (int, float)):
+        try:
+            float(temp)
+        except (ValueError, TypeError):
+            _LOGGER.error(f"Invalid temperature: {temp}")
+            return False
+    
+    return True
+
+
+def _json_clone(obj: Any) -> Any:
+    """Deep-copy JSON-compatible data via an orjson round-trip (much faster than copy.deepcopy)."""
+    return orjson.loads(orjson.dumps(obj))
+
+
+def _thaw_path(tree: Any, path: tuple, value: Any) -> Dict[str, Any]:
+    """Return a copy of a nested dict with value set at path.
+
+    Only the dicts along the path are copied; untouched subtrees stay shared
+    with the original. Schedule and profile trees are treated as immutable
+    once stored, so writers must go through this helper (or replace whole
+    values) instead of mutating shared dicts/lists in place.
+    """
+    updated = dict(tree) if isinstance(tree, dict) else {}
+    if len(path) == 1:
+        updated[path[0]] = value
+    else:
+        updated[path[0]] = _thaw_path(updated.get(path[0]), path[1:], value)
+    return updated
+
+
+def _normalize_single_entity_flag(group_data: Dict[str, Any]) -> bool:
+    """Set _is_single_entity_group from the entity count; return True if it changed."""
+    should_be_single = len(group_data.get("entities", [])) == 1
+    if group_data.get("_is_single_entity_group", False) == should_be_single:
+        return False
+    group_data["_is_single_entity_group"] = should_be_single
     return True
 
 
@@ -61,12 +169,30 @@ class ScheduleStorage:
         self.hass = hass
         self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
         self._data: Dict[str, Any] = {}
+        # Advance history changes on every advance/cancel, so it lives in its own
+        # file and those writes don't re-serialize all groups and profiles
+        self._advance_store = Store(hass, STORAGE_VERSION, ADVANCE_STORAGE_KEY)
+        self._advance_history: Dict[str, Any] = {}
+        self._advance_save_pending = False
+        # Direct references into _data, rebound by _bind_data_views()
+        self._groups: Dict[str, Any] = {}
+        self._profiles: Dict[str, Any] = {}
+        # group name -> (legacy profiles dict it was built from, global name -> legacy key)
+        self._legacy_index: Dict[str, tuple] = {}
+        # active_profile name -> groups using it, rebuilt by _sync_group_profile_views()
+        self._profile_users: Dict[str, List[str]] = {}
+        # entity_id -> groups listing it (in storage order), rebuilt alongside _profile_users
+        self._entity_index: Dict[str, List[str]] = {}
+        # Set while a debounced save (see _schedule_save) has not been written yet
+        self._save_pending = False
+        # id(nodes) -> (nodes, sorted minutes, sorted nodes); see sorted_schedule()
+        self._sorted_cache: Dict[int, tuple] = {}
 
     async def async_load(self) -> None:
         """Load data from storage."""
         data = await self._store.async_load()
         if data is None:
-            self._data = {"groups": {}, "settings": {}, "advance_history": {}}
+            self._data = {"groups": {}, "settings": {}, "_schema_version": SCHEMA_VERSION}
         else:
             self._data = data
             changed_settings = False
@@ -86,24 +212,11 @@ class ScheduleStorage:
             # - backfill any missing keys from other layers (to avoid losing
             #   settings that only exist in older layers).
             if "settings" in self._data and isinstance(self._data.get("settings"), dict):
-                layers: List[Dict[str, Any]] = []
-                s: Any = self._data["settings"]
-
-                while isinstance(s, dict):
-                    layers.append(s)
-                    if "settings" in s and isinstance(s.get("settings"), dict):
-                        s = s["settings"]
-                    else:
-                        break
-
-                if len(layers) > 1:
-                    changed_settings = True
-
                 def parse_version_string(ver: Any) -> tuple:
                     if not isinstance(ver, str):
                         return ()
                     # Extract numeric groups from version string, e.g. '1.14.0.13' -> (1,14,0,13)
-                    nums = re.findall(r"\d+", ver)
+                    nums = _VERSION_RE.findall(ver)
                     return tuple(int(x) for x in nums) if nums else ()
 
                 def layer_version(layer: Dict[str, Any]) -> tuple:
@@ -112,52 +225,85 @@ class ScheduleStorage:
                         return parse_version_string(v.get("integration") or v.get("version"))
                     return parse_version_string(v)
 
-                best_layer = layers[-1]  # default: innermost
-                best_ver = ()
-                for layer in layers:
+                # Walk the layers outer -> inner once, tracking the newest layer
+                # and collecting every layer's keys for backfill (newest doesn't
+                # always contain all fields if the nesting was corrupted).
+                skip_keys = {"settings", "version", "performance_tracking"}
+                backfill: Dict[str, Any] = {}
+                best_layer: Optional[Dict[str, Any]] = None
+                best_ver: tuple = ()
+                depth = 0
+                s: Any = self._data["settings"]
+                layer: Dict[str, Any] = s
+                while isinstance(s, dict):
+                    layer = s
+                    depth += 1
                     parsed = layer_version(layer)
                     if parsed and parsed > best_ver:
                         best_ver = parsed
                         best_layer = layer
+                    for k, v in layer.items():
+                        if k not in skip_keys:
+                            # Inner layers overwrite outer ones, so the innermost value wins
+                            backfill[k] = v
+                    s = layer.get("settings")
+
+                if depth > 1:
+                    changed_settings = True
+
+                if best_layer is None:
+                    best_layer = layer  # default: innermost
 
-                # Start with the newest layer as the source of truth.
+                # The newest layer is the source of truth; other layers only backfill.
                 cleaned_settings: Dict[str, Any] = {
-                    k: v
-                    for k, v in best_layer.items()
-                    if k not in {"settings", "version", "performance_tracking"}
+                    **backfill,
+                    **{k: v for k, v in best_layer.items() if k not in skip_keys},
                 }
 
-                # Backfill missing keys from any layer (newest doesn't always
-                # mean it contains all fields if the nesting was corrupted).
-                for layer in reversed(layers):  # inner -> outer
-                    for k, v in layer.items():
-                        if k in {"settings", "version", "performance_tracking"}:
-                            continue
-                        if k not in cleaned_settings:
-                            cleaned_settings[k] = v
-
                 self._data["settings"] = cleaned_settings
-            # Ensure groups key exists for backwards compatibility
-            if "groups" not in self._data:
-                self._data["groups"] = {}
-            # Ensure settings exist
-            if "settings" not in self._data:
-                self._data["settings"] = {}
-            # Ensure advance_history exists
-            if "advance_history" not in self._data:
-                self._data["advance_history"] = {}
+            # Ensure top-level sections exist for backwards compatibility
+            for key in ("groups", "settings"):
+                self._data.setdefault(key, {})
+            # Drop malformed groups (or a corrupt groups value) so the rest of storage
+            # can assume dicts; the cleaned data is persisted with the migrations below
+            migrated = False
+            groups = self._data["groups"]
+            if not isinstance(groups, dict):
+                _LOGGER.warning("Resetting malformed groups section in storage")
+                groups = self._data["groups"] = {}
+                migrated = True
+            for group_name in [name for name, gd in groups.items() if not isinstance(gd, dict)]:
+                _LOGGER.warning(f"Dropping malformed group '{group_name}' from storage")
+                del groups[group_name]
+                migrated = True
+            # Bound now so the migrations below can use it; profiles are bound
+            # only after _migrate_profiles_to_global (see _bind_data_views)
+            self._groups = groups
+            # Data already at the current layout skips the per-record migration scans
+            schema_version = self._data.get("_schema_version", 0)
             # Migrate old single-schedule format to new day-based format
-            await self._migrate_to_day_schedules()
+            if schema_version < 1:
+                migrated |= await self._migrate_to_day_schedules()
             # Migrate to profile-based structure
-            await self._migrate_to_profiles()
+            if schema_version < 2:
+                migrated |= await self._migrate_to_profiles()
             # Migrate entities to single-entity groups (will remove entities key after migration)
-            await self._migrate_entities_to_groups()
+            if schema_version < 3 or self._data.get("entities"):
+                migrated |= await self._migrate_entities_to_groups()
+            if schema_version < SCHEMA_VERSION:
+                self._data["_schema_version"] = SCHEMA_VERSION
+                migrated = True
             # Migrate per-group profiles to global profile registry
             await self._migrate_profiles_to_global()
             # Normalize older tagged legacy profile names to metadata format
             await self._migrate_legacy_profile_name_suffixes()
+            # One save for the per-record migrations above. It is issued only now
+            # because saving syncs profile views, which seeds a Default global
+            # profile and would make _migrate_profiles_to_global skip.
+            if migrated:
+                await self.async_save()
         # Ensure global profile structure exists and schedule/profile views are synchronized
-        self._ensure_global_profiles_initialized()
+        self._bind_data_views()
         self._sync_group_profile_views()
         # Ensure min/max temp defaults are present in settings
         settings = self._data.get("settings", {})
@@ -166,20 +312,8 @@ class ScheduleStorage:
         if isinstance(settings, dict) and "performance_tracking" in settings:
             del settings["performance_tracking"]
             changed_settings = True
-        if "min_temp" not in settings:
-            # Set default based on temperature unit
-            if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-                settings["min_temp"] = 42.0  # Fahrenheit
-            else:
-                settings["min_temp"] = 5.0  # Celsius
-        if "max_temp" not in settings:
-            # Set default based on temperature unit
-            if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-                settings["max_temp"] = 86.0  # Fahrenheit
-            else:
-                settings["max_temp"] = 30.0  # Celsius
-        if "create_derivative_sensors" not in settings:
-            settings["create_derivative_sensors"] = True  # Default to enabled
+        for key, value in self._default_settings().items():
+            settings.setdefault(key, value)
         if "graph_type" not in settings:
             settings["graph_type"] = "svg"  # Default to SVG graph (classic)
         self._data["settings"] = settings
@@ -190,10 +324,25 @@ class ScheduleStorage:
                 _LOGGER.info("Persisted cleaned settings to storage")
             except Exception as e:
                 _LOGGER.error(f"Failed to persist cleaned settings: {e}")
-        _LOGGER.debug(f"Loaded schedule data: {self._data}")
+        await self._async_load_advance_history()
+        _LOGGER.debug("Loaded schedule data: %s", self._data)
+
+    async def _async_load_advance_history(self) -> None:
+        """Load advance history, moving it out of the main data file on first run."""
+        history = await self._advance_store.async_load()
+        legacy_history = self._data.pop("advance_history", None)
+        if history is None:
+            history = legacy_history if isinstance(legacy_history, dict) else {}
+            if legacy_history is not None:
+                # Write the new file before the main file drops its copy
+                await self._advance_store.async_save(history)
+                _LOGGER.info("Moved advance history to its own storage file")
+        self._advance_history = history
+        if legacy_history is not None:
+            await self.async_save()
     
-    async def _migrate_to_day_schedules(self) -> None:
-        """Migrate existing schedules to day-based format."""
+    async def _migrate_to_day_schedules(self) -> bool:
+        """Migrate existing schedules to day-based format; return True if anything changed."""
         migrated = False
         for entity_id, entity_data in self._data.get("entities", {}).items():
             # Check if already in new format (has schedule_mode key)
@@ -211,7 +360,7 @@ class ScheduleStorage:
                 _LOGGER.info(f"Migrated {entity_id} to day-based schedule format")
         
         # Migrate groups
-        for group_name, group_data in self._data.get("groups", {}).items():
+        for group_name, group_data in self._groups.items():
             if "schedule_mode" not in group_data:
                 old_nodes = group_data.get("nodes", [])
                 group_data["schedule_mode"] = "all_days"
@@ -223,11 +372,10 @@ class ScheduleStorage:
                 migrated = True
                 _LOGGER.info(f"Migrated group '{group_name}' to day-based schedule format")
         
-        if migrated:
-            await self.async_save()
+        return migrated
     
-    async def _migrate_to_profiles(self) -> None:
-        """Migrate existing schedules to profile-based format."""
+    async def _migrate_to_profiles(self) -> bool:
+        """Migrate existing schedules to profile-based format; return True if anything changed."""
         migrated = False
         
         # Migrate entities
@@ -235,7 +383,7 @@ class ScheduleStorage:
             if "profiles" not in entity_data or "active_profile" not in entity_data:
                 # Create Default profile from current schedule
                 schedule_mode = entity_data.get("schedule_mode", "all_days")
-                schedules = copy.deepcopy(entity_data.get("schedules", {"all_days": []}))
+                schedules = _json_clone(entity_data.get("schedules", {"all_days": []}))
                 
                 entity_data["profiles"] = {
                     "Default": {
@@ -248,11 +396,11 @@ class ScheduleStorage:
                 _LOGGER.info(f"Migrated entity {entity_id} to profile-based format")
         
         # Migrate groups
-        for group_name, group_data in self._data.get("groups", {}).items():
+        for group_name, group_data in self._groups.items():
             if "profiles" not in group_data or "active_profile" not in group_data:
                 # Create Default profile from current schedule
                 schedule_mode = group_data.get("schedule_mode", "all_days")
-                schedules = copy.deepcopy(group_data.get("schedules", {"all_days": []}))
+                schedules = _json_clone(group_data.get("schedules", {"all_days": []}))
                 
                 group_data["profiles"] = {
                     "Default": {
@@ -264,44 +412,43 @@ class ScheduleStorage:
                 migrated = True
                 _LOGGER.info(f"Migrated group '{group_name}' to profile-based format")
         
-        if migrated:
-            await self.async_save()
+        return migrated
     
-    async def _migrate_entities_to_groups(self) -> None:
-        """Migrate individual entities to single-entity groups for unified backend."""
+    async def _migrate_entities_to_groups(self) -> bool:
+        """Migrate individual entities to single-entity groups for unified backend; return True if anything changed."""
         migrated = False
+        groups = self._groups
         
-        if "groups" not in self._data:
-            self._data["groups"] = {}
-        
-        # Migrate individual entities to single-entity groups
-        for entity_id, entity_data in list(self._data.get("entities", {}).items()):
-            # Check if entity is already in a multi-entity group
-            entity_in_group = False
-            for group_name, group_data in self._data["groups"].items():
-                if entity_id in group_data.get("entities", []):
-                    entity_in_group = True
-                    break
-            
-            # If not in a group, create a single-entity group
-            if not entity_in_group:
+        # Entities already listed by some group, collected once for O(1) checks
+        grouped_entities = {
+            member
+            for group_data in groups.values()
+            for member in group_data.get("entities", [])
+        }
+        
+        # Migrate individual entities to single-entity groups. The entities dict
+        # itself is not mutated here and is dropped afterwards, so it is iterated
+        # in place and its schedule/profile trees are moved rather than copied.
+        for entity_id, entity_data in self._data.get("entities", {}).items():
+            # If not already in a group, create a single-entity group
+            if entity_id not in grouped_entities:
                 # Use entity_id as the group name (with a prefix to distinguish)
                 group_name = f"__entity_{entity_id}"
                 
                 # Only create if it doesn't already exist
-                if group_name not in self._data["groups"]:
-                    self._data["groups"][group_name] = {
+                if group_name not in groups:
+                    groups[group_name] = {
                         "entities": [entity_id],
                         "enabled": entity_data.get("enabled", True),
                         "ignored": entity_data.get("ignored", False),  # Preserve ignored status
                         "schedule_mode": entity_data.get("schedule_mode", "all_days"),
-                        "schedules": copy.deepcopy(entity_data.get("schedules", {"all_days": []})),
-                        "profiles": copy.deepcopy(entity_data.get("profiles", {
+                        "schedules": entity_data.get("schedules", {"all_days": []}),
+                        "profiles": entity_data.get("profiles", {
                             "Default": {
                                 "schedule_mode": "all_days",
                                 "schedules": {"all_days": []}
                             }
-                        })),
+                        }),
                         "active_profile": entity_data.get("active_profile", "Default"),
                         "_is_single_entity_group": True  # Internal marker
                     }
@@ -314,14 +461,46 @@ class ScheduleStorage:
             del self._data["entities"]
             migrated = True
         
-        if migrated:
-            await self.async_save()
+        return migrated
 
     async def async_save(self) -> None:
         """Save data to storage."""
+        # Schedules may have been replaced; drop sorted views of the old lists
+        self._sorted_cache.clear()
         self._sync_group_profile_views()
+        # Store encodes with orjson and does the atomic tmp-file write in the
+        # executor, so no encode or disk I/O happens on the event loop here.
+        # This also supersedes any pending debounced save.
+        self._save_pending = False
         await self._store.async_save(self._data)
-        _LOGGER.debug(f"Saved schedule data: {self._data}")
+        _LOGGER.debug("Saved schedule data: %s", self._data)
+
+    def _schedule_save(self) -> None:
+        """Queue a debounced save; a burst of mutations collapses into one write."""
+        self._sorted_cache.clear()
+        self._sync_group_profile_views()
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data for a debounced write."""
+        self._save_pending = False
+        return self._data
+
+    @callback
+    def _advance_history_to_save(self) -> Dict[str, Any]:
+        """Return the advance history for a debounced write."""
+        self._advance_save_pending = False
+        return self._advance_history
+
+    async def async_flush(self) -> None:
+        """Write any pending debounced saves immediately."""
+        if self._save_pending:
+            await self.async_save()
+        if self._advance_save_pending:
+            self._advance_save_pending = False
+            await self._advance_store.async_save(self._advance_history)
 
     def _get_default_schedule_template(self) -> List[Dict[str, Any]]:
         """Return configured default schedule template with validation fallback."""
@@ -332,16 +511,16 @@ class ScheduleStorage:
             valid_nodes: List[Dict[str, Any]] = []
             for node in configured:
                 if validate_node(node):
-                    valid_nodes.append(copy.deepcopy(node))
+                    valid_nodes.append(_json_clone(node))
 
             if valid_nodes:
                 return valid_nodes
 
-        return copy.deepcopy(DEFAULT_SCHEDULE)
+        return _json_clone(DEFAULT_SCHEDULE)
 
     def _build_schedules_from_template(self, default_schedule: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Build schedule dictionary from the single default schedule template."""
-        return {"all_days": copy.deepcopy(default_schedule)}
+        return {"all_days": _json_clone(default_schedule)}
 
     def _ensure_global_profiles_initialized(self) -> None:
         """Ensure global profiles exist with at least one usable profile."""
@@ -357,6 +536,16 @@ class ScheduleStorage:
             }
 
         self._data["profiles"] = profiles
+        self._profiles = profiles
+
+    def _bind_data_views(self) -> None:
+        """Bind direct references to the groups and global profiles dicts in _data.
+
+        Must be called whenever _data or its "groups"/"profiles" values are replaced.
+        """
+        self._groups = self._data.setdefault("groups", {})
+        self._ensure_global_profiles_initialized()
+        self._legacy_index.clear()
 
     def _resolve_group_active_global_profile(self, group_data: Dict[str, Any], global_profiles: Dict[str, Any]) -> Optional[str]:
         """Resolve the active global profile for a group using compatibility fields."""
@@ -371,16 +560,23 @@ class ScheduleStorage:
         return "Default" if "Default" in global_profiles else next(iter(global_profiles), None)
 
     def _sync_group_profile_views(self) -> None:
-        """Align active schedule fields with selected global active profile."""
-        groups = self._data.get("groups", {})
-        if not isinstance(groups, dict):
-            return
+        """Align active schedule fields with selected global active profile.
 
+        Also rebuilds the profile -> groups usage map consulted on profile deletion
+        and the entity -> groups index used by the per-entity lookups. Every
+        mutator saves (and so re-syncs) before returning, keeping both current.
+        """
+        groups = self._groups
         self._ensure_global_profiles_initialized()
         global_profiles = self._data.get("profiles", {})
-        for group_data in groups.values():
-            if not isinstance(group_data, dict):
-                continue
+        profile_users: Dict[str, List[str]] = {}
+        entity_index: Dict[str, List[str]] = {}
+        for group_name, group_data in groups.items():
+            in_use = group_data.get("active_profile")
+            if in_use:
+                profile_users.setdefault(in_use, []).append(group_name)
+            for entity_id in group_data.get("entities", []):
+                entity_index.setdefault(entity_id, []).append(group_name)
 
             active_profile = self._resolve_group_active_global_profile(group_data, global_profiles)
             if active_profile:
@@ -389,13 +585,15 @@ class ScheduleStorage:
             if active_profile:
                 active_profile_data = global_profiles.get(active_profile, {})
                 group_data["schedule_mode"] = active_profile_data.get("schedule_mode", "all_days")
-                group_data["schedules"] = copy.deepcopy(active_profile_data.get("schedules", {"all_days": []}))
+                # Shared with the profile; writers replace schedules rather than mutate them
+                group_data["schedules"] = active_profile_data.get("schedules", {"all_days": []})
+
+        self._profile_users = profile_users
+        self._entity_index = entity_index
 
     async def _migrate_profiles_to_global(self) -> None:
         """Migrate legacy per-group profile dictionaries into global profiles."""
-        groups = self._data.get("groups", {})
-        if not isinstance(groups, dict):
-            return
+        groups = self._groups
 
         global_profiles = self._data.get("profiles")
         if not isinstance(global_profiles, dict):
@@ -413,9 +611,6 @@ class ScheduleStorage:
 
         if not global_profiles:
             for group_name, group_data in groups.items():
-                if not isinstance(group_data, dict):
-                    continue
-
                 legacy_profiles = group_data.get("profiles", {})
                 active_profile = group_data.get("active_profile", "Default")
 
@@ -429,12 +624,12 @@ class ScheduleStorage:
                         name_map[profile_name] = new_profile_name
                         global_profiles[new_profile_name] = {
                             "schedule_mode": source_profile.get("schedule_mode", group_data.get("schedule_mode", "all_days")),
-                            "schedules": copy.deepcopy(source_profile.get("schedules", group_data.get("schedules", {"all_days": []})))
+                            "schedules": _json_clone(source_profile.get("schedules", group_data.get("schedules", {"all_days": []})))
                         }
 
                         preserved_legacy_profiles[profile_name] = {
                             "schedule_mode": source_profile.get("schedule_mode", group_data.get("schedule_mode", "all_days")),
-                            "schedules": copy.deepcopy(source_profile.get("schedules", group_data.get("schedules", {"all_days": []}))),
+                            "schedules": _json_clone(source_profile.get("schedules", group_data.get("schedules", {"all_days": []}))),
                             "legacy": True,
                         }
 
@@ -452,13 +647,13 @@ class ScheduleStorage:
                     fallback_name = make_unique_profile_name(f"{group_name} - Default")
                     global_profiles[fallback_name] = {
                         "schedule_mode": group_data.get("schedule_mode", "all_days"),
-                        "schedules": copy.deepcopy(group_data.get("schedules", {"all_days": []}))
+                        "schedules": _json_clone(group_data.get("schedules", {"all_days": []}))
                     }
 
                     legacy_default_name = "Default"
                     preserved_legacy_profiles[legacy_default_name] = {
                         "schedule_mode": group_data.get("schedule_mode", "all_days"),
-                        "schedules": copy.deepcopy(group_data.get("schedules", {"all_days": []})),
+                        "schedules": _json_clone(group_data.get("schedules", {"all_days": []})),
                         "legacy": True,
                     }
                     group_data["profiles"] = preserved_legacy_profiles
@@ -476,17 +671,12 @@ class ScheduleStorage:
 
     async def _migrate_legacy_profile_name_suffixes(self) -> None:
         """Normalize legacy profile names from '<name> [legacy]' to '<name>' with metadata."""
-        groups = self._data.get("groups", {})
-        if not isinstance(groups, dict):
-            return
+        groups = self._groups
 
         suffix = " [legacy]"
         migrated = False
 
         for group_data in groups.values():
-            if not isinstance(group_data, dict):
-                continue
-
             profiles = group_data.get("profiles", {})
             if not isinstance(profiles, dict) or not profiles:
                 continue
@@ -510,7 +700,7 @@ class ScheduleStorage:
 
                     target_name = candidate_name
 
-                normalized_profile = copy.deepcopy(source_profile)
+                normalized_profile = _json_clone(source_profile)
                 if profile_name != target_name and normalized_profile.get("legacy") is not True:
                     normalized_profile["legacy"] = True
                     group_changed = True
@@ -518,7 +708,7 @@ class ScheduleStorage:
                 if target_name in normalized_profiles:
                     # Collision fallback (non-suffix duplicate): preserve existing and keep incoming key.
                     target_name = profile_name
-                    normalized_profile = copy.deepcopy(source_profile)
+                    normalized_profile = _json_clone(source_profile)
 
                 if target_name != profile_name:
                     name_map[profile_name] = target_name
@@ -539,10 +729,14 @@ class ScheduleStorage:
             await self.async_save()
             _LOGGER.info("Normalized legacy profile name suffixes to metadata format")
 
-    async def async_get_settings(self) -> Dict[str, Any]:
+    def get_settings(self) -> Dict[str, Any]:
         """Return current global settings."""
         return self._data.get("settings", {})
 
+    async def async_get_settings(self) -> Dict[str, Any]:
+        """Return current global settings (async wrapper around get_settings)."""
+        return self.get_settings()
+
     async def async_save_settings(self, settings: Dict[str, Any]) -> None:
         """Save global settings to storage by merging and persisting."""
         if "settings" not in self._data:
@@ -550,19 +744,30 @@ class ScheduleStorage:
         # Merge provided settings
         for k, v in settings.items():
             self._data["settings"][k] = v
-        await self.async_save()
-        _LOGGER.debug(f"Saved settings: {self._data.get('settings')}")
+        self._schedule_save()
+        _LOGGER.debug("Saved settings: %s", self._data.get('settings'))
 
-    async def async_get_advance_history(self) -> Dict[str, Any]:
+    def get_advance_history(self) -> Dict[str, Any]:
         """Return advance history for all entities."""
-        return self._data.get("advance_history", {})
+        return self._advance_history
+
+    async def async_get_advance_history(self) -> Dict[str, Any]:
+        """Return advance history for all entities (async wrapper around get_advance_history)."""
+        return self.get_advance_history()
 
     async def async_save_advance_history(self, history: Dict[str, Any]) -> None:
-        """Save advance history to storage."""
-        self._data["advance_history"] = history
-        await self.async_save()
-        _LOGGER.debug(f"Saved advance history: {history}")
+        """Save advance history to its own storage file (debounced)."""
+        self._advance_history = history
+        self._advance_save_pending = True
+        self._advance_store.async_delay_save(self._advance_history_to_save, SAVE_DELAY)
+        _LOGGER.debug("Saved advance history: %s", history)
     
+    def _default_settings(self) -> Dict[str, Any]:
+        """Return the default settings for the configured temperature unit."""
+        if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
+            return _DEFAULT_SETTINGS_F
+        return _DEFAULT_SETTINGS_C
+
     async def async_factory_reset(self) -> None:
         """Reset all data to factory defaults (freshly installed state)."""
         _LOGGER.warning("Factory reset requested - clearing all schedules, groups, and settings")
@@ -572,58 +777,56 @@ class ScheduleStorage:
             "entities": {},
             "groups": {},
             "settings": {},
-            "advance_history": {}
+            "_schema_version": SCHEMA_VERSION,
         }
+        self._bind_data_views()
+        self._advance_history = {}
         
-        # Set default min/max temp based on temperature unit
-        from homeassistant.const import UnitOfTemperature
-        if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-            self._data["settings"]["min_temp"] = 42.0  # Fahrenheit
-            self._data["settings"]["max_temp"] = 86.0  # Fahrenheit
-        else:
-            self._data["settings"]["min_temp"] = 5.0  # Celsius
-            self._data["settings"]["max_temp"] = 30.0  # Celsius
-        
-        # Set default for derivative sensors
-        self._data["settings"]["create_derivative_sensors"] = True
+        # Default min/max temp (per temperature unit) and derivative sensors
+        self._data["settings"].update(self._default_settings())
         
         await self.async_save()
+        self._advance_save_pending = False
+        await self._advance_store.async_save(self._advance_history)
         _LOGGER.info("Factory reset completed - all data cleared and defaults restored")
 
+    def _friendly_name(self, entity_id: str) -> str:
+        """Return the entity's current friendly name, falling back to its entity_id."""
+        if state := self.hass.states.get(entity_id):
+            return state.attributes.get("friendly_name", entity_id)
+        return entity_id
+
     def _find_single_entity_group(self, entity_id: str) -> Optional[str]:
         """Find the single-entity group name for an entity (checks both old __entity_ format and friendly name format)."""
         # Check old format first
         old_format = f"__entity_{entity_id}"
-        if old_format in self._data.get("groups", {}):
-            group_data = self._data["groups"][old_format]
+        if old_format in self._groups:
+            group_data = self._groups[old_format]
             if group_data.get("_is_single_entity_group") and entity_id in group_data.get("entities", []):
                 return old_format
         
-        # Check all groups for single-entity groups containing this entity
-        for group_name, group_data in self._data.get("groups", {}).items():
+        # Check the groups containing this entity for a single-entity group
+        for group_name in self._entity_index.get(entity_id, ()):
+            group_data = self._groups[group_name]
             if (group_data.get("_is_single_entity_group") and 
-                len(group_data.get("entities", [])) == 1 and 
-                entity_id in group_data.get("entities", [])):
+                len(group_data.get("entities", [])) == 1):
                 return group_name
         
         return None
 
     async def async_get_all_entities(self) -> List[str]:
         """Get list of all entity IDs with schedules (from single-entity groups)."""
-        entity_ids = []
-        for group_name, group_data in self._data.get("groups", {}).items():
-            # Extract entity IDs from all groups (single and multi-entity)
-            entity_ids.extend(group_data.get("entities", []))
-        return list(set(entity_ids))  # Remove duplicates
+        # The entity index already holds each entity of every group exactly once
+        return list(self._entity_index)
 
     async def async_get_schedule(self, entity_id: str, day: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get schedule for an entity (from its single-entity group or multi-entity group). If day is specified, returns nodes for that day."""
         # Check if entity is in a single-entity group
         single_group_name = self._find_single_entity_group(entity_id)
         if single_group_name:
-            group_data = self._data["groups"][single_group_name]
+            group_data = self._groups[single_group_name]
             projected_group = self._project_group_runtime_view(group_data)
-            _LOGGER.debug(f"async_get_schedule: entity {entity_id} found in single-entity group - enabled={group_data.get('enabled', True)}")
+            _LOGGER.debug("async_get_schedule: entity %s found in single-entity group - enabled=%s", entity_id, group_data.get('enabled', True))
             
             # If no day specified, return the whole schedule structure
             if day is None:
@@ -637,23 +840,25 @@ class ScheduleStorage:
             }
         
         # Check if entity is in a multi-entity group
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                projected_group = self._project_group_runtime_view(group_data)
-                _LOGGER.debug(f"async_get_schedule: entity {entity_id} found in multi-entity group '{group_name}' - enabled={group_data.get('enabled', True)}")
-                
-                # If no day specified, return the whole schedule structure
-                if day is None:
-                    return projected_group
-                
-                # Return nodes for specific day based on schedule mode
-                return {
-                    "nodes": self._get_nodes_for_day(projected_group, day),
-                    "enabled": group_data.get("enabled", True),
-                    "schedule_mode": projected_group.get("schedule_mode", "all_days")
-                }
+        group_names = self._entity_index.get(entity_id)
+        if group_names:
+            group_name = group_names[0]
+            group_data = self._groups[group_name]
+            projected_group = self._project_group_runtime_view(group_data)
+            _LOGGER.debug("async_get_schedule: entity %s found in multi-entity group '%s' - enabled=%s", entity_id, group_name, group_data.get('enabled', True))
+            
+            # If no day specified, return the whole schedule structure
+            if day is None:
+                return projected_group
+            
+            # Return nodes for specific day based on schedule mode
+            return {
+                "nodes": self._get_nodes_for_day(projected_group, day),
+                "enabled": group_data.get("enabled", True),
+                "schedule_mode": projected_group.get("schedule_mode", "all_days")
+            }
         
-        _LOGGER.debug(f"async_get_schedule: entity {entity_id} not found in any group")
+        _LOGGER.debug("async_get_schedule: entity %s not found in any group", entity_id)
         return None
     
     def _get_nodes_for_day(self, entity_data: Dict[str, Any], day: str) -> List[Dict[str, Any]]:
@@ -661,29 +866,20 @@ class ScheduleStorage:
         schedule_mode = entity_data.get("schedule_mode", "all_days")
         schedules = entity_data.get("schedules", {})
         
-        if schedule_mode == "all_days":
+        if schedule_mode == MODE_ALL_DAYS:
             return schedules.get("all_days", [])
-        elif schedule_mode == "5/2":
-            # If day is already weekday/weekend, use it directly
-            if day in ["weekday", "weekend"]:
-                return schedules.get(day, [])
-            # Otherwise map individual days to weekday/weekend
-            # Weekdays: mon, tue, wed, thu, fri -> "weekday"
-            # Weekends: sat, sun -> "weekend"
-            elif day in ["mon", "tue", "wed", "thu", "fri"]:
-                return schedules.get("weekday", [])
-            else:
-                return schedules.get("weekend", [])
-        elif schedule_mode == "individual":
-            return schedules.get(day, [])
+        if schedule_mode == MODE_5_2 or schedule_mode == MODE_INDIVIDUAL:
+            # 5/2 maps mon-fri to "weekday" and everything else to "weekend";
+            # individual mode keys schedules by the day itself
+            return schedules.get(_schedule_bucket(schedule_mode, day), [])
         
         return []
 
     async def async_set_schedule(self, entity_id: str, nodes: List[Dict[str, Any]], day: Optional[str] = None, schedule_mode: Optional[str] = None) -> None:
         """Set schedule nodes for an entity by creating/updating its single-entity group."""
         # Check if entity is in a multi-entity group
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if not group_data.get("_is_single_entity_group", False) and entity_id in group_data.get("entities", []):
+        for group_name in self._entity_index.get(entity_id, ()):
+            if not self._groups[group_name].get("_is_single_entity_group", False):
                 # Entity is in a real group, update the group schedule instead
                 _LOGGER.info(f"Entity {entity_id} is in group '{group_name}', updating group schedule")
                 await self.async_set_group_schedule(group_name, nodes, day, schedule_mode)
@@ -694,18 +890,11 @@ class ScheduleStorage:
         
         # If no existing group, create new one with friendly name
         if not single_group_name:
-            friendly_name = entity_id
-            if state := self.hass.states.get(entity_id):
-                friendly_name = state.attributes.get("friendly_name", entity_id)
-            single_group_name = friendly_name
-        
-        # Ensure groups dict exists
-        if "groups" not in self._data:
-            self._data["groups"] = {}
+            single_group_name = self._friendly_name(entity_id)
         
         # Create group if it doesn't exist
-        if single_group_name not in self._data["groups"]:
-            self._data["groups"][single_group_name] = {
+        if single_group_name not in self._groups:
+            self._groups[single_group_name] = {
                 "entities": [entity_id],
                 "enabled": True,
                 "ignored": False,
@@ -728,44 +917,38 @@ class ScheduleStorage:
     async def async_add_entity(self, entity_id: str) -> None:
         """Add a new entity with default schedule by creating a single-entity group."""
         # Get friendly name for the group
-        friendly_name = entity_id
-        if state := self.hass.states.get(entity_id):
-            friendly_name = state.attributes.get("friendly_name", entity_id)
-        single_group_name = friendly_name
+        single_group_name = self._friendly_name(entity_id)
         
-        if "groups" not in self._data:
-            self._data["groups"] = {}
-        
-        if single_group_name not in self._data["groups"]:
-            self._data["groups"][single_group_name] = {
+        if single_group_name not in self._groups:
+            self._groups[single_group_name] = {
                 "entities": [entity_id],
                 "enabled": True,
                 "ignored": False,
                 "schedule_mode": "all_days",
                 "schedules": {
-                    "all_days": DEFAULT_SCHEDULE.copy()
+                    "all_days": _json_clone(DEFAULT_SCHEDULE)
                 },
                 "profiles": {
                     "Default": {
                         "schedule_mode": "all_days",
                         "schedules": {
-                            "all_days": DEFAULT_SCHEDULE.copy()
+                            "all_days": _json_clone(DEFAULT_SCHEDULE)
                         }
                     }
                 },
                 "active_profile": "Default",
                 "_is_single_entity_group": True
             }
-            await self.async_save()
+            self._schedule_save()
             _LOGGER.info(f"Added entity {entity_id} with default schedule as single-entity group")
 
     async def async_remove_entity(self, entity_id: str) -> None:
         """Remove an entity and its schedule (single-entity group)."""
         # Remove the single-entity group
         single_group_name = self._find_single_entity_group(entity_id)
-        if single_group_name and single_group_name in self._data.get("groups", {}):
-            del self._data["groups"][single_group_name]
-            await self.async_save()
+        if single_group_name and single_group_name in self._groups:
+            del self._groups[single_group_name]
+            self._schedule_save()
             _LOGGER.info(f"Removed single-entity group '{single_group_name}' for entity {entity_id}")
         else:
             _LOGGER.warning(f"Attempted to remove entity {entity_id} but its single-entity group doesn't exist")
@@ -775,15 +958,12 @@ class ScheduleStorage:
         _LOGGER.info(f"async_set_ignored called: entity_id={entity_id}, ignored={ignored}")
         
         # Find which group this entity belongs to
-        entity_group_name = None
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                entity_group_name = group_name
-                break
+        group_names = self._entity_index.get(entity_id)
+        entity_group_name = group_names[0] if group_names else None
         
         # Update the group if the entity is in one
         if entity_group_name:
-            group_data = self._data["groups"][entity_group_name]
+            group_data = self._groups[entity_group_name]
             group_data["ignored"] = ignored
             # If ignored, disable the group; if not ignored, enable it
             if ignored:
@@ -803,15 +983,15 @@ class ScheduleStorage:
                     group_data["schedules"] = self._build_schedules_from_template(default_schedule)
 
                     profiles = group_data.get("profiles", {})
-                    if not isinstance(profiles, dict):
-                        profiles = {}
-                    if "Default" not in profiles or not isinstance(profiles.get("Default"), dict):
-                        profiles["Default"] = {}
-
-                    default_profile = profiles["Default"]
-                    default_profile["schedule_mode"] = "all_days"
-                    default_profile["schedules"] = copy.deepcopy(group_data["schedules"])
-                    group_data["profiles"] = profiles
+                    default_profile = profiles.get("Default") if isinstance(profiles, dict) else None
+                    if not isinstance(default_profile, dict):
+                        default_profile = {}
+
+                    group_data["profiles"] = _thaw_path(profiles, ("Default",), {
+                        **default_profile,
+                        "schedule_mode": "all_days",
+                        "schedules": group_data["schedules"],
+                    })
                     group_data["active_profile"] = group_data.get("active_profile") or "Default"
 
                     _LOGGER.info(
@@ -821,18 +1001,12 @@ class ScheduleStorage:
             _LOGGER.info(f"Set group '{entity_group_name}' ignored={ignored}, enabled={not ignored} for entity {entity_id}")
         else:
             # Entity is not in any group, create a single-entity group
-            if "groups" not in self._data:
-                self._data["groups"] = {}
-            
             # Get friendly name for the group
-            friendly_name = entity_id
-            if state := self.hass.states.get(entity_id):
-                friendly_name = state.attributes.get("friendly_name", entity_id)
-            single_group_name = friendly_name
+            single_group_name = self._friendly_name(entity_id)
             
             if ignored:
                 # Create with empty schedule and ignored=True
-                self._data["groups"][single_group_name] = {
+                self._groups[single_group_name] = {
                     "entities": [entity_id],
                     "enabled": False,
                     "ignored": True,
@@ -851,16 +1025,16 @@ class ScheduleStorage:
             else:
                 # Create with default schedule and ignored=False
                 default_schedule = self._get_default_schedule_template()
-                self._data["groups"][single_group_name] = {
+                self._groups[single_group_name] = {
                     "entities": [entity_id],
                     "enabled": True,
                     "ignored": False,
                     "schedule_mode": "all_days",
-                    "schedules": {"all_days": copy.deepcopy(default_schedule)},
+                    "schedules": {"all_days": _json_clone(default_schedule)},
                     "profiles": {
                         "Default": {
                             "schedule_mode": "all_days",
-                            "schedules": {"all_days": copy.deepcopy(default_schedule)}
+                            "schedules": {"all_days": _json_clone(default_schedule)}
                         }
                     },
                     "active_profile": "Default",
@@ -868,14 +1042,14 @@ class ScheduleStorage:
                 }
                 _LOGGER.info(f"Created single-entity group '{single_group_name}' for {entity_id} with default schedule")
         
-        await self.async_save()
+        self._schedule_save()
     
     async def async_is_ignored(self, entity_id: str) -> bool:
         """Check if an entity is marked as ignored."""
         # Check if entity is in any group
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                return group_data.get("ignored", False)
+        group_names = self._entity_index.get(entity_id)
+        if group_names:
+            return self._groups[group_names[0]].get("ignored", False)
         
         # Entity not found in any group
         return False
@@ -883,16 +1057,13 @@ class ScheduleStorage:
     async def async_set_enabled(self, entity_id: str, enabled: bool) -> None:
         """Enable or disable scheduling for an entity (via its single-entity group or multi-entity group)."""
         # Find which group this entity belongs to
-        entity_group_name = None
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                entity_group_name = group_name
-                break
+        group_names = self._entity_index.get(entity_id)
+        entity_group_name = group_names[0] if group_names else None
         
         # Update the group
         if entity_group_name:
-            self._data["groups"][entity_group_name]["enabled"] = enabled
-            await self.async_save()
+            self._groups[entity_group_name]["enabled"] = enabled
+            self._schedule_save()
             _LOGGER.info(f"Set group '{entity_group_name}' enabled={enabled} for entity {entity_id}")
         else:
             _LOGGER.warning(f"Entity {entity_id} not found in any group for async_set_enabled")
@@ -921,36 +1092,31 @@ class ScheduleStorage:
         settings = self._data.get("settings", {})
         auto_creation_enabled = settings.get("create_derivative_sensors", True)
         
-        # Get all entity IDs from groups
-        all_entity_ids = await self.async_get_all_entities()
-        
-        deleted_sensors = []
-        errors = []
+        # Every entity listed by a group is a key of the entity index, so it
+        # already serves as the O(1) membership set for the loop below
+        all_entity_ids = self._entity_index
         
         # Get entity registry to find our sensors
         from homeassistant.helpers import entity_registry as er
         entity_registry = er.async_get(self.hass)
         
-        # Find all climate_scheduler rate sensors
+        # Find all climate_scheduler rate sensors via the registry's per-config-entry
+        # index rather than scanning every registered entity
         climate_scheduler_sensors = [
             entry
-            for entry in entity_registry.entities.values()
-            if entry.platform == DOMAIN 
+            for config_entry in self.hass.config_entries.async_entries(DOMAIN)
+            for entry in er.async_entries_for_config_entry(entity_registry, config_entry.entry_id)
+            if entry.platform == DOMAIN
             and entry.domain == "sensor"
-            and entry.unique_id and entry.unique_id.endswith("_rate")
+            and entry.unique_id and entry.unique_id.endswith(_RATE_SENSOR_SUFFIX)
         ]
         
         # If auto-creation is disabled and user confirmed, delete ALL
         if not auto_creation_enabled and confirm_delete_all:
-            _LOGGER.debug(f"Auto-creation disabled and confirmed - deleting all {len(climate_scheduler_sensors)} derivative sensors")
-            for entry in climate_scheduler_sensors:
-                try:
-                    entity_registry.async_remove(entry.entity_id)
-                    deleted_sensors.append(entry.entity_id)
-                    _LOGGER.debug(f"Deleted derivative sensor {entry.entity_id}")
-                except Exception as e:
-                    errors.append(f"{entry.entity_id}: {str(e)}")
-                    _LOGGER.warning(f"Failed to delete {entry.entity_id}: {e}")
+            _LOGGER.debug("Auto-creation disabled and confirmed - deleting all %d derivative sensors", len(climate_scheduler_sensors))
+            deleted_sensors, errors = await self._async_remove_registry_entities(
+                entity_registry, [entry.entity_id for entry in climate_scheduler_sensors]
+            )
             
             return {
                 "deleted_count": len(deleted_sensors),
@@ -970,21 +1136,21 @@ class ScheduleStorage:
             }
         
         # Otherwise, only delete sensors for entities that no longer exist
+        orphaned = []
         for entry in climate_scheduler_sensors:
             # Extract climate entity from unique_id: climate_scheduler_bedroom_rate -> climate.bedroom
+            # Slice off the known prefix/suffix; replace() would also strip a "_rate"
+            # inside the entity name itself
             unique_id = entry.unique_id
-            entity_name = unique_id.replace("climate_scheduler_", "").replace("_rate", "")
+            start = len(_RATE_SENSOR_PREFIX) if unique_id.startswith(_RATE_SENSOR_PREFIX) else 0
+            entity_name = unique_id[start:-len(_RATE_SENSOR_SUFFIX)]
             climate_entity_id = f"climate.{entity_name}"
             
             if climate_entity_id not in all_entity_ids:
                 # Entity no longer exists in storage, delete the sensor
-                try:
-                    entity_registry.async_remove(entry.entity_id)
-                    deleted_sensors.append(entry.entity_id)
-                    _LOGGER.debug(f"Deleted orphaned derivative sensor {entry.entity_id} (entity {climate_entity_id} no longer exists)")
-                except Exception as e:
-                    errors.append(f"{entry.entity_id}: {str(e)}")
-                    _LOGGER.warning(f"Failed to delete {entry.entity_id}: {e}")
+                orphaned.append(entry.entity_id)
+        
+        deleted_sensors, errors = await self._async_remove_registry_entities(entity_registry, orphaned)
         
         return {
             "deleted_count": len(deleted_sensors),
@@ -993,6 +1159,26 @@ class ScheduleStorage:
             "message": f"Deleted {len(deleted_sensors)} orphaned derivative sensors"
         }
 
+    async def _async_remove_registry_entities(self, entity_registry: Any, entity_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """Remove entities from the registry, yielding to the event loop between batches.
+
+        Returns (removed entity_ids, error messages).
+        """
+        removed: List[str] = []
+        errors: List[str] = []
+        for index, entity_id in enumerate(entity_ids, 1):
+            try:
+                entity_registry.async_remove(entity_id)
+                removed.append(entity_id)
+            except Exception as e:
+                errors.append(f"{entity_id}: {str(e)}")
+                _LOGGER.warning("Failed to delete %s: %s", entity_id, e)
+            if index % _REMOVE_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+        if removed:
+            _LOGGER.debug("Deleted %d derivative sensors: %s", len(removed), removed)
+        return removed, errors
+
     async def async_cleanup_unmonitored_storage(self, delete: bool = False) -> Dict[str, Any]:
         """Cleanup stale storage references for unmonitored or missing entities.
 
@@ -1003,9 +1189,7 @@ class ScheduleStorage:
         - Invalid profile structures and broken active profile pointers
         - Orphaned advance history entries
         """
-        groups = self._data.get("groups", {})
-        if not isinstance(groups, dict):
-            groups = {}
+        groups = self._groups
 
         climate_entity_ids = set(self.hass.states.async_entity_ids("climate"))
 
@@ -1020,13 +1204,10 @@ class ScheduleStorage:
         repaired_active_profiles: list[Dict[str, str]] = []
         removed_advance_history: list[str] = []
 
+        # async_load already dropped non-dict group entries
         for group_name, raw_group_data in groups.items():
-            if not isinstance(raw_group_data, dict):
-                removed_groups.append({"group": group_name, "reason": "invalid_group_data"})
-                changed = True
-                continue
-
-            group_data = copy.deepcopy(raw_group_data)
+            # One deep copy per group; everything below may share subtrees of it
+            group_data = _json_clone(raw_group_data)
 
             if group_data.get("ignored", False):
                 removed_groups.append({"group": group_name, "reason": "unmonitored"})
@@ -1109,7 +1290,7 @@ class ScheduleStorage:
 
                 valid_profiles[profile_name] = {
                     "schedule_mode": profile_data.get("schedule_mode", group_data.get("schedule_mode", "all_days")),
-                    "schedules": copy.deepcopy(profile_schedules),
+                    "schedules": profile_schedules,
                 }
 
                 if profile_data.get("legacy") is True:
@@ -1118,7 +1299,7 @@ class ScheduleStorage:
             if not valid_profiles:
                 valid_profiles["Default"] = {
                     "schedule_mode": group_data.get("schedule_mode", "all_days"),
-                    "schedules": copy.deepcopy(group_data.get("schedules", {"all_days": []})),
+                    "schedules": group_data.get("schedules", {"all_days": []}),
                 }
                 changed = True
 
@@ -1137,11 +1318,9 @@ class ScheduleStorage:
 
             active_profile_data = group_data["profiles"][group_data["active_profile"]]
             group_data["schedule_mode"] = active_profile_data.get("schedule_mode", "all_days")
-            group_data["schedules"] = copy.deepcopy(active_profile_data.get("schedules", {"all_days": []}))
+            group_data["schedules"] = active_profile_data.get("schedules", {"all_days": []})
 
-            should_be_single = len(normalized_entities) == 1
-            if group_data.get("_is_single_entity_group", False) != should_be_single:
-                group_data["_is_single_entity_group"] = should_be_single
+            if _normalize_single_entity_flag(group_data):
                 changed = True
                 if group_name not in repaired_groups:
                     repaired_groups.append(group_name)
@@ -1149,12 +1328,11 @@ class ScheduleStorage:
             kept_groups[group_name] = group_data
             kept_entities.update(normalized_entities)
 
-        current_groups = self._data.get("groups", {})
-        if current_groups != kept_groups:
+        if self._groups != kept_groups:
             changed = True
 
-        advance_history_raw = self._data.get("advance_history", {})
-        advance_history: Dict[str, Any] = copy.deepcopy(advance_history_raw) if isinstance(advance_history_raw, dict) else {}
+        advance_history_raw = self._advance_history
+        advance_history: Dict[str, Any] = _json_clone(advance_history_raw) if isinstance(advance_history_raw, dict) else {}
         if not isinstance(advance_history_raw, dict):
             changed = True
 
@@ -1189,12 +1367,15 @@ class ScheduleStorage:
             }
 
         self._data["groups"] = kept_groups
-        self._data["advance_history"] = advance_history
+        self._groups = kept_groups
+        self._advance_history = advance_history
         if "entities" in self._data:
             del self._data["entities"]
 
         if changed:
             await self.async_save()
+            self._advance_save_pending = False
+            await self._advance_store.async_save(self._advance_history)
 
         message = (
             f"Removed {len(removed_groups)} groups, "
@@ -1219,9 +1400,9 @@ class ScheduleStorage:
     async def async_is_enabled(self, entity_id: str) -> bool:
         """Check if scheduling is enabled for an entity."""
         # Check if entity is in any group
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                return group_data.get("enabled", True)
+        group_names = self._entity_index.get(entity_id)
+        if group_names:
+            return self._groups[group_names[0]].get("enabled", True)
         
         # Entity not found in any group
         return False
@@ -1231,54 +1412,25 @@ class ScheduleStorage:
         if not nodes:
             return 18.0  # Default fallback
         
-        # Sort nodes by time
-        sorted_nodes = sorted(nodes, key=lambda n: self._time_to_minutes(n["time"]))
-        
-        # Convert current time to minutes since midnight
-        current_minutes = current_time.hour * 60 + current_time.minute
-        
-        # Find the active node (most recent node before or at current time)
-        active_node = None
-        
-        for node in sorted_nodes:
-            node_minutes = self._time_to_minutes(node["time"])
-            if node_minutes <= current_minutes:
-                active_node = node
-            else:
-                break
-        
-        # If no node found before current time, use last node from previous day (wrap around)
-        if active_node is None:
-            active_node = sorted_nodes[-1]
-        
-        return active_node["temp"]
+        return self.get_active_node(nodes, current_time)["temp"]
+
+    def get_active_node(self, nodes: List[Dict[str, Any]], current_time: time, cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Get the active node at a given time.
 
-    def get_active_node(self, nodes: List[Dict[str, Any]], current_time: time) -> Optional[Dict[str, Any]]:
-        """Get the active node at a given time."""
+        Pass cache=False for node lists built by the caller rather than read
+        from storage, so they are not kept in the sorted-view cache.
+        """
         if not nodes:
             return None
         
-        # Sort nodes by time
-        sorted_nodes = sorted(nodes, key=lambda n: self._time_to_minutes(n["time"]))
+        minutes, sorted_nodes = self.sorted_schedule(nodes, cache)
         
         # Convert current time to minutes since midnight
         current_minutes = current_time.hour * 60 + current_time.minute
         
-        # Find the active node (most recent node before or at current time)
-        active_node = None
-        
-        for node in sorted_nodes:
-            node_minutes = self._time_to_minutes(node["time"])
-            if node_minutes <= current_minutes:
-                active_node = node
-            else:
-                break
-        
-        # If no node found before current time, use last node from previous day (wrap around)
-        if active_node is None:
-            active_node = sorted_nodes[-1]
-        
-        return active_node
+        # Active node is the last one at or before the current time. Index -1
+        # (nothing before now) wraps around to the previous day's last node.
+        return sorted_nodes[bisect.bisect_right(minutes, current_minutes) - 1]
     
     async def get_active_node_for_group(self, group_name: str, current_time: Optional[time] = None, current_day: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get the active node for a group at a given time, handling cross-day transitions in individual mode.
@@ -1291,79 +1443,90 @@ class ScheduleStorage:
         Returns:
             The active node at the specified time, or None if no schedule exists
         """
+        group_data = self._groups.get(group_name)
+        if group_data is None:
+            return None
+        
+        now = datetime.now() if current_time is None or current_day is None else None
         if current_time is None:
-            current_time = datetime.now().time()
-        if current_day is None:
-            current_day = datetime.now().strftime('%a').lower()
+            current_time = now.time()
         
-        # Get group schedule for current day
-        group_schedule = await self.async_get_group_schedule(group_name, current_day)
-        if not group_schedule or not group_schedule.get("nodes"):
+        # Same day resolution as async_get_group_schedule, read straight from the
+        # group. All-days schedules (the common case) never need the weekday.
+        schedule_mode = group_data.get("schedule_mode", "all_days")
+        schedules = group_data.get("schedules", {})
+        if schedule_mode == MODE_ALL_DAYS:
+            nodes = schedules.get("all_days")
+        else:
+            if current_day is None:
+                current_day = now.strftime('%a').lower()
+            nodes = schedules.get(_schedule_bucket(schedule_mode, current_day))
+        if not nodes:
             return None
         
-        schedule_mode = group_schedule.get("schedule_mode", "all_days")
-        nodes = group_schedule["nodes"]
+        # Sorted view fetched once and shared by both branches below
+        minutes, sorted_nodes = self.sorted_schedule(nodes)
+        current_minutes = current_time.hour * 60 + current_time.minute
         
         # In individual or 5/2 mode, check if we need previous day's schedule
-        if schedule_mode in ["individual", "5/2"] and nodes:
-            sorted_nodes = sorted(nodes, key=lambda n: self._time_to_minutes(n["time"]))
-            current_minutes = current_time.hour * 60 + current_time.minute
-            first_node_minutes = self._time_to_minutes(sorted_nodes[0]["time"])
+        if schedule_mode in (MODE_INDIVIDUAL, MODE_5_2) and current_minutes < minutes[0]:
+            # We're before the first node of today, get previous day/period's last node
+            prev_day = PREV_DAY[current_day]
             
-            if current_minutes < first_node_minutes:
-                # We're before the first node of today, get previous day/period's last node
-                days_of_week = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-                current_day_index = days_of_week.index(current_day)
-                prev_day = days_of_week[(current_day_index - 1) % 7]
-                
-                prev_day_schedule = await self.async_get_group_schedule(group_name, prev_day)
-                if prev_day_schedule and prev_day_schedule.get("nodes"):
-                    prev_nodes = prev_day_schedule["nodes"]
-                    sorted_prev_nodes = sorted(prev_nodes, key=lambda n: self._time_to_minutes(n["time"]))
-                    return sorted_prev_nodes[-1]
-        
-        # Normal case: get active node from current day's schedule
-        return self.get_active_node(nodes, current_time)
+            prev_nodes = schedules.get(_schedule_bucket(schedule_mode, prev_day))
+            if prev_nodes:
+                return self.sorted_schedule(prev_nodes)[1][-1]
+        
+        # Normal case: get active node from current day's schedule (see get_active_node)
+        return sorted_nodes[bisect.bisect_right(minutes, current_minutes) - 1]
     
     def get_next_node(self, nodes: List[Dict[str, Any]], current_time: time) -> Optional[Dict[str, Any]]:
         """Get the next scheduled node after the current time."""
         if not nodes:
             return None
         
-        # Sort nodes by time
-        sorted_nodes = sorted(nodes, key=lambda n: self._time_to_minutes(n["time"]))
+        minutes, sorted_nodes = self.sorted_schedule(nodes)
         
         # Convert current time to minutes since midnight
         current_minutes = current_time.hour * 60 + current_time.minute
         
-        # Find the next node (first node after current time)
-        for node in sorted_nodes:
-            node_minutes = self._time_to_minutes(node["time"])
-            if node_minutes > current_minutes:
-                return node
-        
-        # If no node found after current time, wrap around to first node (next day)
-        return sorted_nodes[0]
+        # Next node is the first one after the current time, wrapping around to
+        # the first node (next day) when none is left today
+        index = bisect.bisect_right(minutes, current_minutes)
+        return sorted_nodes[index] if index < len(sorted_nodes) else sorted_nodes[0]
 
-    @staticmethod
-    def _time_to_minutes(time_str: str) -> int:
-        """Convert HH:MM string to minutes since midnight."""
-        parts = time_str.split(":")
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        return hours * 60 + minutes
+    def sorted_schedule(self, nodes: List[Dict[str, Any]], cache: bool = True) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """Return (minutes, nodes) for a node list, both ordered by time.
+
+        Stored node lists are copy-on-write, so the result is cached by list
+        identity. Each entry keeps the list alive so its id cannot be reused,
+        and the cache is dropped on save, when old lists may have been
+        replaced. Lists built by the caller should pass cache=False.
+        """
+        entry = self._sorted_cache.get(id(nodes))
+        if entry is not None and entry[0] is nodes:
+            return entry[1], entry[2]
+
+        # Parse each HH:MM once; the key keeps the sort stable for equal times
+        keyed = sorted(((_time_to_minutes(n["time"]), n) for n in nodes), key=itemgetter(0))
+        minutes = [m for m, _ in keyed]
+        sorted_nodes = [n for _, n in keyed]
+        if not cache:
+            return minutes, sorted_nodes
+
+        if len(self._sorted_cache) >= _SORTED_CACHE_MAX:
+            self._sorted_cache.clear()
+        self._sorted_cache[id(nodes)] = (nodes, minutes, sorted_nodes)
+        return minutes, sorted_nodes
 
     # Group Management Methods
 
     async def async_create_group(self, group_name: str) -> None:
         """Create a new group."""
-        if "groups" not in self._data:
-            self._data["groups"] = {}
-        
-        if group_name in self._data["groups"]:
+        if group_name in self._groups:
             raise ValueError(f"Group '{group_name}' already exists")
         
-        self._data["groups"][group_name] = {
+        self._groups[group_name] = {
             "entities": [],
             "enabled": True,
             "ignored": False,
@@ -1381,28 +1544,30 @@ class ScheduleStorage:
             },
             "active_profile": "Default"
         }
-        await self.async_save()
-        _LOGGER.info(f"Created group '{group_name}'")
+        self._schedule_save()
+        _LOGGER.info("Created group '%s'", group_name)
 
     async def async_delete_group(self, group_name: str) -> None:
         """Delete a group."""
-        if group_name in self._data.get("groups", {}):
-            del self._data["groups"][group_name]
-            await self.async_save()
-            _LOGGER.info(f"Deleted group '{group_name}'")
+        if group_name in self._groups:
+            del self._groups[group_name]
+            self._legacy_index.pop(group_name, None)
+            self._schedule_save()
+            _LOGGER.info("Deleted group '%s'", group_name)
     
     async def async_rename_group(self, old_name: str, new_name: str) -> None:
         """Rename a group."""
-        if old_name not in self._data.get("groups", {}):
+        if old_name not in self._groups:
             raise ValueError(f"Group '{old_name}' does not exist")
         
-        if new_name in self._data.get("groups", {}):
+        if new_name in self._groups:
             raise ValueError(f"Group '{new_name}' already exists")
         
         # Rename the group
-        self._data["groups"][new_name] = self._data["groups"].pop(old_name)
-        await self.async_save()
-        _LOGGER.info(f"Renamed group from '{old_name}' to '{new_name}'")
+        self._groups[new_name] = self._groups.pop(old_name)
+        self._legacy_index.pop(old_name, None)
+        self._schedule_save()
+        _LOGGER.info("Renamed group from '%s' to '%s'", old_name, new_name)
 
     async def async_add_entity_to_group(self, group_name: str, entity_id: str) -> None:
         """Add an entity to a group.
@@ -1410,123 +1575,109 @@ class ScheduleStorage:
         If the entity is unmonitored (not in any group), it will be added to the target group.
         If the entity is in a single-entity group, that group will be deleted and the entity moved.
         """
-        if group_name not in self._data.get("groups", {}):
+        group_data = self._groups.get(group_name)
+        if group_data is None:
             raise ValueError(f"Group '{group_name}' does not exist")
         
-        group_data = self._data["groups"][group_name]
-        
-        # Check if entity is currently in a different group
+        # Groups currently listing the entity, from the index (not a list scan)
+        member_of = self._entity_index.get(entity_id, ())
+        already_in_group = group_name in member_of
+
+        # Check if entity is currently in a different group (first one in storage order)
         old_single_entity_group = None
-        entity_found_in_group = False
-        for existing_group_name, existing_group_data in self._data.get("groups", {}).items():
-            if existing_group_name != group_name and entity_id in existing_group_data.get("entities", []):
-                # Found entity in a different group
-                entity_found_in_group = True
-                if existing_group_data.get("_is_single_entity_group") and len(existing_group_data.get("entities", [])) == 1:
-                    # It's a single-entity group - mark for deletion
-                    old_single_entity_group = existing_group_name
-                    _LOGGER.info(f"Entity {entity_id} is in single-entity group '{existing_group_name}' which will be deleted")
-                # Remove entity from the old group
-                existing_group_data["entities"].remove(entity_id)
-                break
-        
-        # Log if entity wasn't in any group (unmonitored entity being added)
-        if not entity_found_in_group:
-            _LOGGER.info(f"Adding unmonitored entity {entity_id} to group '{group_name}'")
-        
-        if entity_id not in group_data["entities"]:
+        existing_group_name = next((name for name in member_of if name != group_name), None)
+        if existing_group_name is not None:
+            existing_group_data = self._groups[existing_group_name]
+            existing_entities = existing_group_data["entities"]
+            if existing_group_data.get("_is_single_entity_group") and len(existing_entities) == 1:
+                # It's a single-entity group - mark for deletion
+                old_single_entity_group = existing_group_name
+                _LOGGER.info("Entity %s is in single-entity group '%s' which will be deleted", entity_id, existing_group_name)
+            # Remove entity from the old group; entity order is kept as the UI shows it
+            existing_entities.remove(entity_id)
+        else:
+            # Log if entity wasn't in any group (unmonitored entity being added)
+            _LOGGER.info("Adding unmonitored entity %s to group '%s'", entity_id, group_name)
+        
+        if not already_in_group:
             group_data["entities"].append(entity_id)
-            entity_count = len(group_data["entities"])
-            
-            # Normalize _is_single_entity_group flag based on actual entity count
-            if entity_count == 1:
-                # Group now has exactly 1 entity - mark as single-entity group
-                group_data["_is_single_entity_group"] = True
-                _LOGGER.info(f"Group '{group_name}' now has 1 entity - marked as single-entity group")
-            elif entity_count >= 2:
-                # Group now has 2+ entities - ensure it's marked as multi-entity group
-                if group_data.get("_is_single_entity_group"):
-                    group_data["_is_single_entity_group"] = False
-                    _LOGGER.info(f"Group '{group_name}' now has {entity_count} entities - converted to multi-entity group")
+            if _normalize_single_entity_flag(group_data):
+                _LOGGER.info(
+                    "Group '%s' now has %s entities - single-entity group: %s",
+                    group_name, len(group_data["entities"]), group_data["_is_single_entity_group"],
+                )
             
             # Delete the old single-entity group if it existed
             if old_single_entity_group:
-                del self._data["groups"][old_single_entity_group]
-                _LOGGER.info(f"Deleted single-entity group '{old_single_entity_group}'")
+                del self._groups[old_single_entity_group]
+                _LOGGER.info("Deleted single-entity group '%s'", old_single_entity_group)
             
-            await self.async_save()
-            _LOGGER.info(f"Added {entity_id} to group '{group_name}'")
+            self._schedule_save()
+            _LOGGER.info("Added %s to group '%s'", entity_id, group_name)
+        elif existing_group_name is not None:
+            # Already a member here, but the duplicate listing in the other group was
+            # removed above; persist it and resync the entity index
+            self._schedule_save()
 
     async def async_remove_entity_from_group(self, group_name: str, entity_id: str) -> None:
         """Remove an entity from a group and create a new single-entity group for it."""
-        if group_name in self._data.get("groups", {}):
-            entities = self._data["groups"][group_name]["entities"]
-            if entity_id in entities:
-                # Get the current group data before removing the entity
-                group_data = self._data["groups"][group_name]
-                
-                entities.remove(entity_id)
-                
-                # If only 1 entity remains, convert the group to a single-entity group
-                if len(entities) == 1:
-                    group_data["_is_single_entity_group"] = True
-                    _LOGGER.info(f"Group '{group_name}' now has only 1 entity - converted to single-entity group")
-                
-                # Create a new single-entity group for the removed entity using friendly name
-                friendly_name = entity_id
-                if state := self.hass.states.get(entity_id):
-                    friendly_name = state.attributes.get("friendly_name", entity_id)
-                single_group_name = friendly_name
-                
-                if "groups" not in self._data:
-                    self._data["groups"] = {}
-                
-                # Create the new single-entity group with current data from the group
-                self._data["groups"][single_group_name] = {
-                    "entities": [entity_id],
-                    "enabled": group_data.get("enabled", True),
-                    "ignored": group_data.get("ignored", False),
-                    "schedule_mode": group_data.get("schedule_mode", "all_days"),
-                    "schedules": copy.deepcopy(group_data.get("schedules", {"all_days": []})),
-                    "profiles": copy.deepcopy(group_data.get("profiles", {
-                        "Default": {
-                            "schedule_mode": "all_days",
-                            "schedules": {"all_days": []}
-                        }
-                    })),
-                    "active_profile": group_data.get("active_profile", "Default"),
-                    "_is_single_entity_group": True
+        group_data = self._groups.get(group_name)
+        if group_data is None or group_name not in self._entity_index.get(entity_id, ()):
+            return
+        entities = group_data["entities"]
+        entities.remove(entity_id)
+
+        # If only 1 entity remains, convert the group to a single-entity group.
+        # An emptied group keeps its flag, so a single-entity group stays hidden.
+        if len(entities) == 1 and not group_data.get("_is_single_entity_group", False):
+            group_data["_is_single_entity_group"] = True
+            _LOGGER.info("Group '%s' now has only 1 entity - converted to single-entity group", group_name)
+        
+        # Create a new single-entity group for the removed entity using friendly name
+        single_group_name = self._friendly_name(entity_id)
+        
+        # Create the new single-entity group with current data from the group.
+        # Schedule/profile trees are shared, not copied (see _thaw_path).
+        self._groups[single_group_name] = {
+            "entities": [entity_id],
+            "enabled": group_data.get("enabled", True),
+            "ignored": group_data.get("ignored", False),
+            "schedule_mode": group_data.get("schedule_mode", "all_days"),
+            "schedules": group_data.get("schedules", {"all_days": []}),
+            "profiles": group_data.get("profiles", {
+                "Default": {
+                    "schedule_mode": "all_days",
+                    "schedules": {"all_days": []}
                 }
-                
-                await self.async_save()
-                _LOGGER.info(f"Removed {entity_id} from group '{group_name}' and created single-entity group '{single_group_name}'")
+            }),
+            "active_profile": group_data.get("active_profile", "Default"),
+            "_is_single_entity_group": True
+        }
+        
+        self._schedule_save()
+        _LOGGER.info("Removed %s from group '%s' and created single-entity group '%s'", entity_id, group_name, single_group_name)
 
     async def async_get_groups(self) -> Dict[str, Any]:
         """Get all groups."""
         self._sync_group_profile_views()
-        groups = self._data.get("groups", {})
-        projected: Dict[str, Any] = {}
-        for group_name, group_data in groups.items():
-            if isinstance(group_data, dict):
-                projected[group_name] = self._project_group_runtime_view(group_data)
-            else:
-                projected[group_name] = group_data
-        return projected
+        return {
+            group_name: self._project_group_runtime_view(group_data)
+            for group_name, group_data in self._groups.items()
+        }
 
     async def async_get_group(self, group_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific group."""
         self._sync_group_profile_views()
-        group_data = self._data.get("groups", {}).get(group_name)
-        if not isinstance(group_data, dict):
-            return group_data
+        group_data = self._groups.get(group_name)
+        if group_data is None:
+            return None
         return self._project_group_runtime_view(group_data)
 
     def _project_group_runtime_view(self, group_data: Dict[str, Any]) -> Dict[str, Any]:
         """Return a runtime view exposing global profiles while preserving persisted legacy profiles."""
-        view = copy.deepcopy(group_data)
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
-        view["profiles"] = copy.deepcopy(global_profiles)
+        view = _json_clone(group_data)
+        global_profiles = self._profiles
+        view["profiles"] = _json_clone(global_profiles)
 
         active_profile = self._resolve_group_active_global_profile(group_data, global_profiles)
         if active_profile:
@@ -1535,12 +1686,14 @@ class ScheduleStorage:
 
         return view
 
+    def get_entity_groups(self, entity_id: str) -> List[str]:
+        """Return the names of all groups listing an entity, in storage order."""
+        return list(self._entity_index.get(entity_id, ()))
+
     async def async_get_entity_group(self, entity_id: str) -> Optional[str]:
         """Get the group name that an entity belongs to."""
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if entity_id in group_data.get("entities", []):
-                return group_name
-        return None
+        group_names = self._entity_index.get(entity_id)
+        return group_names[0] if group_names else None
 
     async def async_set_group_schedule(self, group_name: str, nodes: List[Dict[str, Any]], day: Optional[str] = None, schedule_mode: Optional[str] = None, profile_name: Optional[str] = None) -> None:
         """Set schedule for a group (applies to all entities in the group).
@@ -1548,10 +1701,13 @@ class ScheduleStorage:
         If profile_name is provided, saves to that specific profile without changing the active profile.
         Otherwise saves to the currently active profile.
         """
-        if group_name not in self._data.get("groups", {}):
+        group_data = self._groups.get(group_name)
+        if group_data is None:
             raise ValueError(f"Group '{group_name}' does not exist")
-        
-        group_data = self._data["groups"][group_name]
+
+        # Take ownership of the caller's nodes once; past this point the schedule
+        # trees are shared between group and profile and never mutated in place.
+        nodes = _json_clone(nodes)
 
         def apply_nodes_to_schedules(
             schedules: Dict[str, Any],
@@ -1560,45 +1716,27 @@ class ScheduleStorage:
             schedule_day: Optional[str],
         ) -> Dict[str, Any]:
             """Apply incoming nodes to a schedule dict using mode/day mapping semantics."""
-            updated = copy.deepcopy(schedules) if isinstance(schedules, dict) else {}
-
+            # Path-copy: only the top-level schedule dict is rebuilt, other days stay shared
             if schedule_day is None:
-                if mode == "all_days":
-                    updated["all_days"] = schedule_nodes
-                elif mode == "5/2":
-                    updated["weekday"] = schedule_nodes
-                else:
-                    updated["mon"] = schedule_nodes
-                return updated
-
-            if mode == "5/2":
-                if schedule_day == "weekday":
-                    updated["weekday"] = schedule_nodes
-                elif schedule_day == "weekend":
-                    updated["weekend"] = schedule_nodes
-                elif schedule_day in ["mon", "tue", "wed", "thu", "fri"]:
-                    updated["weekday"] = schedule_nodes
-                else:
-                    updated["weekend"] = schedule_nodes
+                bucket = _DEFAULT_WRITE_BUCKETS.get(mode, "mon")
             else:
-                updated[schedule_day] = schedule_nodes
-
-            return updated
+                bucket = _schedule_bucket(mode, schedule_day)
+            return _thaw_path(schedules, (bucket,), schedule_nodes)
 
         # Determine which profile to save to (global profile namespace)
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
+        global_profiles = self._profiles
 
         resolved_active_profile = self._resolve_group_active_global_profile(group_data, global_profiles)
         target_profile = profile_name if profile_name else resolved_active_profile
 
         # Verify profile exists if explicitly specified
-        if profile_name and target_profile not in global_profiles:
+        target = global_profiles.get(target_profile)
+        if profile_name and target is None:
             raise ValueError(f"Profile '{profile_name}' does not exist")
 
         # Create profile if it doesn't exist (only for active profile flow)
-        if target_profile not in global_profiles:
-            global_profiles[target_profile] = {
+        if target is None:
+            target = global_profiles[target_profile] = {
                 "schedule_mode": group_data.get("schedule_mode", "all_days"),
                 "schedules": {}
             }
@@ -1606,70 +1744,55 @@ class ScheduleStorage:
         is_explicit_non_active_profile_save = bool(profile_name and profile_name != resolved_active_profile)
 
         if is_explicit_non_active_profile_save:
-            target_mode = schedule_mode if schedule_mode is not None else global_profiles[target_profile].get("schedule_mode", "all_days")
-            target_schedules = apply_nodes_to_schedules(
-                global_profiles[target_profile].get("schedules", {}),
+            target_mode = schedule_mode if schedule_mode is not None else target.get("schedule_mode", "all_days")
+            target["schedules"] = apply_nodes_to_schedules(
+                target.get("schedules", {}),
                 target_mode,
                 nodes,
                 day,
             )
-
-            global_profiles[target_profile]["schedule_mode"] = target_mode
-            global_profiles[target_profile]["schedules"] = copy.deepcopy(target_schedules)
+            target["schedule_mode"] = current_mode = target_mode
         else:
             # Active-profile save path updates group runtime state and mirrors to active global profile
             if schedule_mode is not None:
                 group_data["schedule_mode"] = schedule_mode
 
             current_mode = group_data.get("schedule_mode", "all_days")
-            group_data["schedules"] = apply_nodes_to_schedules(
+            target["schedules"] = group_data["schedules"] = apply_nodes_to_schedules(
                 group_data.get("schedules", {}),
                 current_mode,
                 nodes,
                 day,
             )
-
-            global_profiles[target_profile]["schedule_mode"] = current_mode
-            global_profiles[target_profile]["schedules"] = copy.deepcopy(group_data["schedules"])
-
-        self._data["profiles"] = global_profiles
+            target["schedule_mode"] = current_mode
 
         # Keep group runtime schedule aligned with active profile for non-active profile saves
         if is_explicit_non_active_profile_save:
-            active_profile = resolved_active_profile
-            if active_profile in global_profiles:
-                group_data["schedule_mode"] = global_profiles[active_profile].get("schedule_mode", "all_days")
-                group_data["schedules"] = copy.deepcopy(global_profiles[active_profile].get("schedules", {}))
-
-            current_mode = global_profiles[target_profile].get("schedule_mode", "all_days")
-        else:
-            current_mode = group_data.get("schedule_mode", "all_days")
+            active = global_profiles.get(resolved_active_profile)
+            if active is not None:
+                group_data["schedule_mode"] = active.get("schedule_mode", "all_days")
+                group_data["schedules"] = active.get("schedules", {})
         
-        _LOGGER.info(f"Saved group schedule to profile '{target_profile}' for group '{group_name}' - day: {day}, mode: {current_mode}, nodes: {len(nodes)}")
-        _LOGGER.debug(f"Profile schedules after save: {global_profiles[target_profile]['schedules'].keys()}")
+        _LOGGER.info("Saved group schedule to profile '%s' for group '%s' - day: %s, mode: %s, nodes: %s", target_profile, group_name, day, current_mode, len(nodes))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Profile schedules after save: %s", target["schedules"].keys())
         
-        await self.async_save()
-        _LOGGER.info(f"Set schedule for group '{group_name}' with {len(nodes)} nodes (day: {day}, mode: {schedule_mode})")
+        self._schedule_save()
+        _LOGGER.info("Set schedule for group '%s' with %s nodes (day: %s, mode: %s)", group_name, len(nodes), day, schedule_mode)
     
     async def async_get_group_schedule(self, group_name: str, day: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get schedule for a group (same logic as entity schedule retrieval)."""
-        if group_name not in self._data.get("groups", {}):
+        group_data = self._groups.get(group_name)
+        if group_data is None:
             return None
-        
-        group_data = self._data["groups"][group_name]
         schedule_mode = group_data.get("schedule_mode", "all_days")
         schedules = group_data.get("schedules", {})
         
         # Same day resolution logic as entity schedules
-        if schedule_mode == "all_days":
+        if schedule_mode == MODE_ALL_DAYS:
             nodes = schedules.get("all_days", [])
-        elif schedule_mode == "5/2":
-            if day in ["mon", "tue", "wed", "thu", "fri"]:
-                nodes = schedules.get("weekday", [])
-            else:  # sat, sun
-                nodes = schedules.get("weekend", [])
-        else:  # individual
-            nodes = schedules.get(day, [])
+        else:
+            nodes = schedules.get(_schedule_bucket(schedule_mode, day), [])
         
         return {
             "nodes": nodes,
@@ -1680,79 +1803,69 @@ class ScheduleStorage:
     
     async def async_enable_group(self, group_name: str) -> None:
         """Enable a group schedule."""
-        if group_name not in self._data.get("groups", {}):
+        group_data = self._groups.get(group_name)
+        if group_data is None:
             raise ValueError(f"Group '{group_name}' does not exist")
         
-        self._data["groups"][group_name]["enabled"] = True
-        await self.async_save()
-        _LOGGER.info(f"Enabled group '{group_name}'")
+        group_data["enabled"] = True
+        self._schedule_save()
+        _LOGGER.info("Enabled group '%s'", group_name)
     
     async def async_disable_group(self, group_name: str) -> None:
         """Disable a group schedule."""
-        if group_name not in self._data.get("groups", {}):
+        group_data = self._groups.get(group_name)
+        if group_data is None:
             raise ValueError(f"Group '{group_name}' does not exist")
         
-        self._data["groups"][group_name]["enabled"] = False
-        await self.async_save()
-        _LOGGER.info(f"Disabled group '{group_name}'")
+        group_data["enabled"] = False
+        self._schedule_save()
+        _LOGGER.info("Disabled group '%s'", group_name)
     
+    def _resolve_schedule_group(self, schedule_id: str) -> str:
+        """Return the group a schedule id refers to: a group name, or an entity_id via the index."""
+        if schedule_id in self._groups:
+            return schedule_id
+        group_names = self._entity_index.get(schedule_id)
+        if not group_names:
+            raise ValueError(f"Schedule '{schedule_id}' not found")
+        return group_names[0]
+
     async def async_enable_schedule(self, schedule_id: str) -> None:
         """Enable a schedule by group name or entity_id."""
-        # Check if it's a group name
-        if schedule_id in self._data.get("groups", {}):
-            await self.async_enable_group(schedule_id)
-        else:
-            # Treat as entity_id - find its group
-            group_name = await self.async_get_entity_group(schedule_id)
-            if group_name:
-                await self.async_enable_group(group_name)
-            else:
-                raise ValueError(f"Schedule '{schedule_id}' not found")
+        await self.async_enable_group(self._resolve_schedule_group(schedule_id))
     
     async def async_disable_schedule(self, schedule_id: str) -> None:
         """Disable a schedule by group name or entity_id."""
-        # Check if it's a group name
-        if schedule_id in self._data.get("groups", {}):
-            await self.async_disable_group(schedule_id)
-        else:
-            # Treat as entity_id - find its group
-            group_name = await self.async_get_entity_group(schedule_id)
-            if group_name:
-                await self.async_disable_group(group_name)
-            else:
-                raise ValueError(f"Schedule '{schedule_id}' not found")
+        await self.async_disable_group(self._resolve_schedule_group(schedule_id))
     
     # Profile Management Methods
     
     async def async_create_profile(self, target_id: str, profile_name: str) -> None:
         """Create a new global schedule profile."""
-        if target_id not in self._data.get("groups", {}):
+        target_group = self._groups.get(target_id)
+        if target_group is None:
             raise ValueError(f"Group '{target_id}' does not exist")
 
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
+        global_profiles = self._profiles
 
         if profile_name in global_profiles:
             raise ValueError(f"Profile '{profile_name}' already exists")
 
         # Seed from current target group's active schedule for convenience
-        target_group = self._data["groups"][target_id]
         global_profiles[profile_name] = {
             "schedule_mode": target_group.get("schedule_mode", "all_days"),
-            "schedules": copy.deepcopy(target_group.get("schedules", {"all_days": []}))
+            "schedules": target_group.get("schedules", {"all_days": []})
         }
-        self._data["profiles"] = global_profiles
 
-        await self.async_save()
-        _LOGGER.info(f"Created global profile '{profile_name}'")
+        self._schedule_save()
+        _LOGGER.info("Created global profile '%s'", profile_name)
     
     async def async_delete_profile(self, target_id: str, profile_name: str) -> None:
         """Delete a global schedule profile."""
-        if target_id not in self._data.get("groups", {}):
+        if target_id not in self._groups:
             raise ValueError(f"Group '{target_id}' does not exist")
 
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
+        global_profiles = self._profiles
 
         if profile_name not in global_profiles:
             raise ValueError(f"Profile '{profile_name}' does not exist")
@@ -1760,23 +1873,21 @@ class ScheduleStorage:
         if len(global_profiles) <= 1:
             raise ValueError(f"Cannot delete the last profile")
 
-        for group_name, group_data in self._data.get("groups", {}).items():
-            if group_data.get("active_profile") == profile_name:
-                raise ValueError(f"Cannot delete profile '{profile_name}' because it is active for group '{group_name}'")
+        users = self._profile_users.get(profile_name)
+        if users:
+            raise ValueError(f"Cannot delete profile '{profile_name}' because it is active for group '{users[0]}'")
 
         del global_profiles[profile_name]
-        self._data["profiles"] = global_profiles
 
-        await self.async_save()
-        _LOGGER.info(f"Deleted global profile '{profile_name}'")
+        self._schedule_save()
+        _LOGGER.info("Deleted global profile '%s'", profile_name)
     
     async def async_rename_profile(self, target_id: str, old_name: str, new_name: str) -> None:
         """Rename a global schedule profile."""
-        if target_id not in self._data.get("groups", {}):
+        if target_id not in self._groups:
             raise ValueError(f"Group '{target_id}' does not exist")
 
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
+        global_profiles = self._profiles
 
         if old_name not in global_profiles:
             raise ValueError(f"Profile '{old_name}' does not exist")
@@ -1785,54 +1896,65 @@ class ScheduleStorage:
             raise ValueError(f"Profile '{new_name}' already exists")
 
         global_profiles[new_name] = global_profiles.pop(old_name)
-        self._data["profiles"] = global_profiles
 
-        for group_data in self._data.get("groups", {}).values():
+        for group_data in self._groups.values():
             if group_data.get("active_profile") == old_name:
                 group_data["active_profile"] = new_name
 
-        await self.async_save()
-        _LOGGER.info(f"Renamed global profile from '{old_name}' to '{new_name}'")
+        self._schedule_save()
+        _LOGGER.info("Renamed global profile from '%s' to '%s'", old_name, new_name)
     
+    def _legacy_profile_index(self, target_id: str, legacy_profiles: Any) -> Dict[str, str]:
+        """Map global profile names to the matching legacy profile key of a group.
+
+        Built once per legacy profiles dict and cached by identity; those dicts
+        are replaced rather than mutated (see _thaw_path), so a new dict means
+        a rebuild.
+        """
+        if not isinstance(legacy_profiles, dict):
+            return {}
+
+        cached = self._legacy_index.get(target_id)
+        if cached is not None and cached[0] is legacy_profiles:
+            return cached[1]
+
+        prefix = f"{target_id} - "
+        suffix = " [legacy]"
+        index: Dict[str, str] = {}
+        # Lowest precedence: pre-metadata snapshots tagged with a name suffix
+        for key, profile_data in legacy_profiles.items():
+            if isinstance(key, str) and key.endswith(suffix) and isinstance(profile_data, dict):
+                index[f"{prefix}{key[:-len(suffix)]}"] = key
+        # Preferred mapping: original legacy profile key with explicit metadata
+        for key, profile_data in legacy_profiles.items():
+            if isinstance(profile_data, dict) and profile_data.get("legacy") is True:
+                index[f"{prefix}{key}"] = key
+        # Exact key matches always win
+        for key in legacy_profiles:
+            index[key] = key
+
+        self._legacy_index[target_id] = (legacy_profiles, index)
+        return index
+
     async def async_set_active_profile(self, target_id: str, profile_name: str) -> None:
         """Set the active profile for a group."""
 
-        if target_id not in self._data.get("groups", {}):
+        target_data = self._groups.get(target_id)
+        if target_data is None:
             raise ValueError(f"Group '{target_id}' does not exist")
 
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
+        global_profiles = self._profiles
 
         if profile_name not in global_profiles:
             raise ValueError(f"Profile '{profile_name}' does not exist")
 
-        target_data = self._data["groups"][target_id]
-
         # Set the active global profile (runtime path)
         target_data["active_profile_global"] = profile_name
 
         # Keep legacy active profile pointer for downgrade compatibility
         legacy_profiles = target_data.get("profiles", {})
         legacy_active = target_data.get("active_profile")
-        legacy_candidate = None
-        if isinstance(legacy_profiles, dict):
-            if profile_name in legacy_profiles:
-                legacy_candidate = profile_name
-            else:
-                prefix = f"{target_id} - "
-                if profile_name.startswith(prefix):
-                    original_name = profile_name[len(prefix):]
-
-                    # Preferred mapping: original legacy profile key with explicit metadata
-                    original_profile = legacy_profiles.get(original_name)
-                    if isinstance(original_profile, dict) and original_profile.get("legacy") is True:
-                        legacy_candidate = original_name
-                    else:
-                        # Backward compatibility for pre-metadata snapshots using name suffix tagging
-                        tagged_name = f"{original_name} [legacy]"
-                        tagged_profile = legacy_profiles.get(tagged_name)
-                        if isinstance(tagged_profile, dict):
-                            legacy_candidate = tagged_name
+        legacy_candidate = self._legacy_profile_index(target_id, legacy_profiles).get(profile_name)
 
         if legacy_candidate:
             target_data["active_profile"] = legacy_candidate
@@ -1848,35 +1970,30 @@ class ScheduleStorage:
         # Load the profile's schedule into the main schedule fields
         profile_data = global_profiles[profile_name]
         target_data["schedule_mode"] = profile_data.get("schedule_mode", "all_days")
-        target_data["schedules"] = copy.deepcopy(profile_data.get("schedules", {}))
+        target_data["schedules"] = profile_data.get("schedules", {})
         
-        _LOGGER.info(f"Switched to profile '{profile_name}' for group '{target_id}'")
-        _LOGGER.debug(f"Loaded schedule mode: {target_data['schedule_mode']}, schedule keys: {target_data['schedules'].keys()}")
+        _LOGGER.info("Switched to profile '%s' for group '%s'", profile_name, target_id)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Loaded schedule mode: %s, schedule keys: %s", target_data['schedule_mode'], target_data['schedules'].keys())
         
-        await self.async_save()
-        _LOGGER.info(f"Set active profile to '{profile_name}' for group '{target_id}'")
+        self._schedule_save()
+        _LOGGER.info("Set active profile to '%s' for group '%s'", profile_name, target_id)
     
-    async def async_get_profiles(self, target_id: str) -> Dict[str, Any]:
-        """Get all global profiles."""
-        if target_id not in self._data.get("groups", {}):
-            return {}
+    async def async_get_profiles(self, target_id: str) -> Mapping[str, Any]:
+        """Get a read-only view of all global profiles."""
+        if target_id not in self._groups:
+            return _EMPTY_PROFILES
 
-        self._ensure_global_profiles_initialized()
-        return self._data.get("profiles", {})
+        return MappingProxyType(self._profiles)
     
     async def async_get_active_profile_name(self, target_id: str) -> Optional[str]:
         """Get the name of the active profile for a group."""
-        target_key = "groups"
-        
-        if target_id not in self._data.get(target_key, {}):
+        target_data = self._groups.get(target_id)
+        if target_data is None:
             return None
-        
-        target_data = self._data[target_key][target_id]
-        self._ensure_global_profiles_initialized()
-        global_profiles = self._data.get("profiles", {})
-        return self._resolve_group_active_global_profile(target_data, global_profiles)
 
-    async def async_get_global_profiles(self) -> Dict[str, Any]:
-        """Get the global profile dictionary."""
-        self._ensure_global_profiles_initialized()
-        return self._data.get("profiles", {})
\ No newline at end of file
+        return self._resolve_group_active_global_profile(target_data, self._profiles)
+
+    async def async_get_global_profiles(self) -> Mapping[str, Any]:
+        """Get a read-only view of the global profile dictionary."""
+        return MappingProxyType(self._profiles)
\ No newline at end of file
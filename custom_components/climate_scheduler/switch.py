@@ -1,20 +1,39 @@
 """Switch platform for Climate Scheduler - Exposes schedules in scheduler-component format."""
+import bisect
 import logging
 import hashlib
+import re
 from datetime import datetime, time, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, DAYS_OF_WEEK
 
 _LOGGER = logging.getLogger(__name__)
 
+# Current switch unique_ids end in "_" plus a 6-hex-char token (see ClimateSchedulerSwitch)
+_TOKEN_SUFFIX_RE = re.compile(r"_[0-9a-f]{6}$", re.IGNORECASE)
+
+# Config entry data flag set once the pre-token switch cleanup has run
+_LEGACY_SWITCHES_CLEANED = "legacy_switches_cleaned"
+
+# Days served by the "weekday" schedule in 5/2 mode
+_WEEKDAY_SET = frozenset(DAYS_OF_WEEK[:5])
+
+# scheduler-component "weekdays" attribute per schedule mode (unknown modes -> daily)
+_WEEKDAYS_FOR_MODE: Dict[str, List[str]] = {
+    "all_days": ["daily"],
+    "5/2": ["workday", "weekend"],
+    "individual": list(DAYS_OF_WEEK),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -22,35 +41,36 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Climate Scheduler switch entities from a config entry."""
-    from homeassistant.helpers import entity_registry as er
-    
     storage = hass.data[DOMAIN]["storage"]
     coordinator = hass.data[DOMAIN]["coordinator"]
     entity_registry = er.async_get(hass)
     
     # Clean up old switch entities that don't have the token suffix
-    # (These are from before we added the unique_id token)
-    old_entities_removed = 0
-    for entry in list(entity_registry.entities.values()):
-        if entry.platform != DOMAIN or entry.domain != "switch":
-            continue
-        
-        # Old entities have unique_id like "climate_scheduler_schedule_bathroom"
-        # New entities have unique_id like "climate_scheduler_schedule_climate.bathroom_abc123"
-        # or "climate_scheduler_schedule_Bathroom_abc123"
-        if entry.unique_id and entry.unique_id.startswith(f"{DOMAIN}_schedule_"):
-            # Check if it's missing the token (no underscore followed by 6 hex chars at the end)
-            parts = entry.unique_id.split("_")
-            last_part = parts[-1] if parts else ""
+    # (These are from before we added the unique_id token). Switches created
+    # since always carry the token, so this only needs to run once per entry.
+    if not config_entry.data.get(_LEGACY_SWITCHES_CLEANED):
+        old_entities_removed = 0
+        for entry in er.async_entries_for_config_entry(entity_registry, config_entry.entry_id):
+            if entry.platform != DOMAIN or entry.domain != "switch":
+                continue
             
-            # If the last part is not a 6-character hex token, it's an old entity
-            if len(last_part) != 6 or not all(c in "0123456789abcdef" for c in last_part.lower()):
-                _LOGGER.info(f"Removing old scheduler entity: {entry.entity_id} (unique_id: {entry.unique_id})")
-                entity_registry.async_remove(entry.entity_id)
-                old_entities_removed += 1
-    
-    if old_entities_removed > 0:
-        _LOGGER.info(f"Removed {old_entities_removed} old scheduler switch entities")
+            # Old entities have unique_id like "climate_scheduler_schedule_bathroom"
+            # New entities have unique_id like "climate_scheduler_schedule_climate.bathroom_abc123"
+            # or "climate_scheduler_schedule_Bathroom_abc123"
+            if entry.unique_id and entry.unique_id.startswith(f"{DOMAIN}_schedule_"):
+                # If it's missing the token (no underscore followed by 6 hex chars at the end),
+                # it's an old entity
+                if not _TOKEN_SUFFIX_RE.search(entry.unique_id):
+                    _LOGGER.info(f"Removing old scheduler entity: {entry.entity_id} (unique_id: {entry.unique_id})")
+                    entity_registry.async_remove(entry.entity_id)
+                    old_entities_removed += 1
+        
+        if old_entities_removed > 0:
+            _LOGGER.info(f"Removed {old_entities_removed} old scheduler switch entities")
+        
+        new_data = dict(config_entry.data)
+        new_data[_LEGACY_SWITCHES_CLEANED] = True
+        hass.config_entries.async_update_entry(config_entry, data=new_data)
     
     switches = []
     
@@ -77,6 +97,23 @@ async def async_setup_entry(
 class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
     """Switch entity that exposes a climate schedule in scheduler-component format."""
 
+    # Fields owned by this class live in slots; the Home Assistant base classes
+    # keep their own __dict__ for hass, coordinator and the _attr_* values.
+    __slots__ = (
+        "storage",
+        "_group_name",
+        "_group_data",
+        "_cached_next_trigger",
+        "_cached_next_trigger_iso",
+        "_cached_next_slot",
+        "_cached_actions",
+        "_cached_next_entries",
+        "_attrs_cache",
+        "_attrs_cache_minute",
+        "_attrs_cache_source",
+        "_action_targets",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -92,8 +129,10 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         self._group_name = group_name
         self._group_data = group_data
         
-        # Generate a stable token for the entity_id (6 chars like scheduler-component)
-        token = hashlib.md5(group_name.encode()).hexdigest()[:6]
+        # Generate a stable token for the entity_id (6 chars like scheduler-component).
+        # The token is part of the registered unique_id, so the hash must not change;
+        # usedforsecurity=False keeps md5 usable on FIPS-restricted builds.
+        token = hashlib.md5(group_name.encode(), usedforsecurity=False).hexdigest()[:6]
         
         # For single-entity groups, use a cleaner name
         if group_name.startswith("__entity_"):
@@ -109,15 +148,21 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         
         # Cache for computed attributes
         self._cached_next_trigger: Optional[datetime] = None
+        self._cached_next_trigger_iso: Optional[str] = None
         self._cached_next_slot: Optional[int] = None
         self._cached_actions: List[Dict[str, Any]] = []
         self._cached_next_entries: List[Dict[str, Any]] = []
+        # Entity ids the scheduler-component actions target, derived from the group data
+        self._action_targets: List[str] = []
+        self._update_action_targets()
+        # Last attributes dict, valid for the wall-clock minute and group data it was built from
+        self._attrs_cache: Optional[Dict[str, Any]] = None
+        self._attrs_cache_minute: Optional[int] = None
+        self._attrs_cache_source: Optional[Dict[str, Any]] = None
 
     @property
     def is_on(self) -> bool:
         """Return true if schedule is enabled."""
-        # Refresh group data from storage
-        self._refresh_group_data()
         return self._group_data.get("enabled", True)
 
     @property
@@ -138,9 +183,21 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return scheduler-component compatible attributes."""
-        self._refresh_group_data()
-        self._compute_schedule_attributes()
+        """Return scheduler-component compatible attributes.
+
+        The result only changes when the minute rolls over or the group data is
+        replaced (see _async_refresh_group_data), so it is reused until then.
+        """
+        now = dt_util.now()
+        minute = int(now.timestamp() // 60)
+        if (
+            self._attrs_cache is not None
+            and self._attrs_cache_minute == minute
+            and self._attrs_cache_source is self._group_data
+        ):
+            return self._attrs_cache
+        
+        self._compute_schedule_attributes(now)
         
         active_profile = self._group_data.get("active_profile", "Default")
         profiles = self._group_data.get("profiles", {})
@@ -154,7 +211,7 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         
         attrs = {
             # Core scheduler-component attributes
-            "next_trigger": self._cached_next_trigger.isoformat() if self._cached_next_trigger else None,
+            "next_trigger": self._cached_next_trigger_iso,
             "next_slot": self._cached_next_slot,
             "actions": self._cached_actions,
             
@@ -173,17 +230,11 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
             "timeslots": self._cached_actions,  # Alias
         }
         
+        self._attrs_cache = attrs
+        self._attrs_cache_minute = minute
+        self._attrs_cache_source = self._group_data
         return attrs
 
-    def _refresh_group_data(self) -> None:
-        """Refresh group data from storage."""
-        # This is called frequently, so we cache the lookup
-        import asyncio
-        if asyncio.iscoroutinefunction(self.storage.async_get_group):
-            # Can't call async from sync property, so we'll need to handle this differently
-            # For now, keep the cached version and update on coordinator updates
-            pass
-
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -194,16 +245,33 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         self.async_write_ha_state()
 
     async def _async_refresh_group_data(self) -> None:
-        """Async refresh of group data."""
+        """Async refresh of group data.
+
+        This is the only place self._group_data is replaced; properties read the
+        cached copy, since they cannot await storage.
+        """
         group_data = await self.storage.async_get_group(self._group_name)
         if group_data:
             self._group_data = group_data
+            self._update_action_targets()
 
-    def _compute_schedule_attributes(self) -> None:
-        """Compute next_trigger, next_slot, actions, and next_entries."""
-        now = dt_util.now()
+    def _update_action_targets(self) -> None:
+        """Derive the entity ids actions are built for from the current group data."""
+        entities = self._group_data.get("entities", [])
+        
+        # If entities list is empty, try to derive from group name for single-entity groups
+        if not entities and self._group_name.startswith("__entity_"):
+            entities = [self._group_name.replace("__entity_", "")]
+            _LOGGER.debug(f"Derived entity from group name: {entities}")
+        
+        # With no known entities, actions target "unknown" so the structure is still populated
+        self._action_targets = list(entities) or ["unknown"]
+
+    def _compute_schedule_attributes(self, now: datetime) -> None:
+        """Compute next_trigger, next_slot, actions, and next_entries as of now."""
         current_time = now.time()
-        current_day = now.strftime("%a").lower()  # mon, tue, wed, etc.
+        # mon, tue, wed, etc.; a tuple lookup rather than locale-dependent strftime("%a")
+        current_day = DAYS_OF_WEEK[now.weekday()]
         
         active_profile = self._group_data.get("active_profile", "Default")
         profiles = self._group_data.get("profiles", {})
@@ -217,143 +285,110 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         
         if not current_schedule:
             self._cached_next_trigger = None
+            self._cached_next_trigger_iso = None
             self._cached_next_slot = None
             self._cached_actions = []
             self._cached_next_entries = []
             return
         
-        # Sort nodes by time
-        sorted_nodes = sorted(current_schedule, key=lambda n: self._time_str_to_minutes(n.get("time", "00:00")))
+        # Parse each node's time once: (minutes since midnight, (hours, minutes) or None, node).
+        # Unparseable times sort as midnight, as before.
+        parsed = []
+        for node in current_schedule:
+            hm = self._parse_time(node.get("time", "00:00"))
+            parsed.append((hm[0] * 60 + hm[1] if hm else 0, hm, node))
+        parsed.sort(key=lambda p: p[0])
         
-        # Find next node
+        # Find next node (first one after the current minute)
         next_node = None
         next_node_index = None
         
-        for idx, node in enumerate(sorted_nodes):
-            node_time_str = node.get("time", "00:00")
-            node_minutes = self._time_str_to_minutes(node_time_str)
-            current_minutes = current_time.hour * 60 + current_time.minute
-            
-            if node_minutes > current_minutes:
-                next_node = node
-                next_node_index = idx
-                break
+        current_minutes = current_time.hour * 60 + current_time.minute
+        idx = bisect.bisect_right([p[0] for p in parsed], current_minutes)
+        if idx < len(parsed):
+            next_node = parsed[idx][2]
+            next_node_index = idx
+        
+        # Node datetimes below are derived from today's midnight, built once
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         # If no node found after current time, use first node tomorrow
-        if next_node is None and sorted_nodes:
-            next_node = sorted_nodes[0]
+        if next_node is None and parsed:
+            next_node = parsed[0][2]
             next_node_index = 0
             # Add one day
-            next_trigger_dt = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            next_trigger_dt = midnight + timedelta(days=1)
         else:
-            next_trigger_dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            next_trigger_dt = midnight
         
         if next_node:
-            # Parse time
-            time_str = next_node.get("time", "00:00")
+            next_hm = parsed[next_node_index][1]
             try:
-                hours, minutes = time_str.split(":")
-                next_trigger_dt = next_trigger_dt.replace(hour=int(hours), minute=int(minutes))
-            except (ValueError, AttributeError):
-                _LOGGER.warning(f"Invalid time format: {time_str}")
+                if next_hm is None:
+                    raise ValueError
+                next_trigger_dt = next_trigger_dt.replace(hour=next_hm[0], minute=next_hm[1])
+            except ValueError:
+                _LOGGER.warning(f"Invalid time format: {next_node.get('time', '00:00')}")
                 next_trigger_dt = None
             
             self._cached_next_trigger = next_trigger_dt
+            self._cached_next_trigger_iso = next_trigger_dt.isoformat() if next_trigger_dt else None
             self._cached_next_slot = next_node_index
             
-            # Build actions list for all nodes
-            entities = self._group_data.get("entities", [])
-            
-            # If entities list is empty, try to derive from group name for single-entity groups
-            if not entities and self._group_name.startswith("__entity_"):
-                entities = [self._group_name.replace("__entity_", "")]
-                _LOGGER.debug(f"Derived entity from group name: {entities}")
-            
-            self._cached_actions = []
+            # Single pass over the sorted nodes builds both output lists
+            targets = self._action_targets
+            actions: List[Dict[str, Any]] = []
+            next_entries: List[Dict[str, Any]] = []
             
-            for node in sorted_nodes:
+            for _, hm, node in parsed:
                 temp = node.get("temp")
                 
-                # If still no entities, create a generic action without entity_id
-                # This allows the data structure to be populated even if entities are missing
-                if not entities:
-                    action = {
-                        "entity_id": "unknown",
-                        "service": "climate.set_temperature",
-                        "data": {"temperature": temp}
-                    }
-                    
-                    # Add HVAC mode if present
-                    if "hvac_mode" in node:
-                        action["data"]["hvac_mode"] = node["hvac_mode"]
-                    
-                    # Add preset mode if present
-                    if "preset_mode" in node:
-                        action["service"] = "climate.set_preset_mode"
-                        action["data"] = {"preset_mode": node["preset_mode"]}
-                    
-                    self._cached_actions.append(action)
+                # scheduler-component actions: preset mode wins over temperature/HVAC mode.
+                # Service and data depend only on the node, so they are built once and
+                # shared (read-only) by every entity's action.
+                if "preset_mode" in node:
+                    service = "climate.set_preset_mode"
+                    data = {"preset_mode": node["preset_mode"]}
                 else:
-                    # Normal case: create actions for each entity
-                    for entity_id in entities:
-                        action = {
+                    service = "climate.set_temperature"
+                    data = {"temperature": temp}
+                    if "hvac_mode" in node:
+                        data["hvac_mode"] = node["hvac_mode"]
+                actions.extend(
+                    [{"entity_id": entity_id, "service": service, "data": data} for entity_id in targets]
+                )
+                
+                # next_entries (fallback format): absolute datetime + temperature actions
+                if hm is None:
+                    continue
+                try:
+                    node_dt = midnight.replace(hour=hm[0], minute=hm[1])
+                except ValueError:
+                    continue
+                
+                # If node time is in the past today, it's for tomorrow
+                if node_dt < now:
+                    node_dt += timedelta(days=1)
+                
+                node_iso = node_dt.isoformat()
+                next_entries.append({
+                    "time": node_iso,
+                    "trigger_time": node_iso,
+                    "actions": [
+                        {
                             "entity_id": entity_id,
                             "service": "climate.set_temperature",
                             "data": {"temperature": temp}
                         }
-                        
-                        # Add HVAC mode if present
-                        if "hvac_mode" in node:
-                            action["data"]["hvac_mode"] = node["hvac_mode"]
-                        
-                        # Add preset mode if present
-                        if "preset_mode" in node:
-                            action["service"] = "climate.set_preset_mode"
-                            action["data"] = {"preset_mode": node["preset_mode"]}
-                        
-                        self._cached_actions.append(action)
+                        for entity_id in targets
+                    ]
+                })
             
-            # Build next_entries (fallback format)
-            self._cached_next_entries = []
-            for node in sorted_nodes:
-                temp = node.get("temp")
-                time_str = node.get("time", "00:00")
-                
-                # Calculate absolute datetime for this node
-                try:
-                    hours, minutes = time_str.split(":")
-                    node_dt = now.replace(hour=int(hours), minute=int(minutes), second=0, microsecond=0)
-                    
-                    # If node time is in the past today, it's for tomorrow
-                    if node_dt < now:
-                        node_dt += timedelta(days=1)
-                    
-                    entry_actions = []
-                    
-                    # If still no entities, create a generic action
-                    if not entities:
-                        entry_actions.append({
-                            "entity_id": "unknown",
-                            "service": "climate.set_temperature",
-                            "data": {"temperature": temp}
-                        })
-                    else:
-                        for entity_id in entities:
-                            entry_actions.append({
-                                "entity_id": entity_id,
-                                "service": "climate.set_temperature",
-                                "data": {"temperature": temp}
-                            })
-                    
-                    self._cached_next_entries.append({
-                        "time": node_dt.isoformat(),
-                        "trigger_time": node_dt.isoformat(),
-                        "actions": entry_actions
-                    })
-                except (ValueError, AttributeError):
-                    continue
+            self._cached_actions = actions
+            self._cached_next_entries = next_entries
         else:
             self._cached_next_trigger = None
+            self._cached_next_trigger_iso = None
             self._cached_next_slot = None
             self._cached_actions = []
             self._cached_next_entries = []
@@ -368,7 +403,7 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
         if schedule_mode == "all_days":
             return schedules.get("all_days", [])
         elif schedule_mode == "5/2":
-            if current_day in ["mon", "tue", "wed", "thu", "fri"]:
+            if current_day in _WEEKDAY_SET:
                 return schedules.get("weekday", [])
             else:
                 return schedules.get("weekend", [])
@@ -379,23 +414,16 @@ class ClimateSchedulerSwitch(CoordinatorEntity, SwitchEntity):
 
     def _get_weekdays_list(self, schedule_mode: str) -> List[str]:
         """Get weekdays list for scheduler-component compatibility."""
-        if schedule_mode == "all_days":
-            return ["daily"]
-        elif schedule_mode == "5/2":
-            return ["workday", "weekend"]
-        elif schedule_mode == "individual":
-            return ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-        else:
-            return ["daily"]
+        return _WEEKDAYS_FOR_MODE.get(schedule_mode, _WEEKDAYS_FOR_MODE["all_days"])
 
     @staticmethod
-    def _time_str_to_minutes(time_str: str) -> int:
-        """Convert HH:MM string to minutes since midnight."""
+    def _parse_time(time_str: str) -> Optional[Tuple[int, int]]:
+        """Parse an HH:MM string into (hours, minutes), or None if it is malformed."""
         try:
             hours, minutes = time_str.split(":")
-            return int(hours) * 60 + int(minutes)
+            return int(hours), int(minutes)
         except (ValueError, AttributeError):
-            return 0
+            return None
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Enable the schedule."""